@@ -0,0 +1,69 @@
+"""Streaming, allocation-free parser for the ADC display's serial output.
+
+The display sends lines like ``b"W=  123.45\\r\\n"``.  Bytes are read with
+``uart.readinto`` into one preallocated bytearray and fed through a small
+state machine that builds the number as an int while it goes, so a partial
+line simply carries over to the next read, several lines in one read are all
+reported, and junk is counted instead of raising.
+"""
+
+# parser states
+_SKIP = 0       # before '=' (label, or recovering from a bad line)
+_NUM = 1        # after '=', accumulating digits
+
+_MAX_DIGITS = 7  # keeps the accumulator a small int (no heap allocation)
+
+
+class AdcReader:
+    def __init__(self, uart, size=64):
+        self.uart = uart
+        self.buf = bytearray(size)
+        self.state = _SKIP
+        self.acc = 0
+        self.div = 0            # 0 = no '.' yet, else 10 ** digits after it
+        self.neg = False
+        self.digits = 0
+        self.lines = 0
+        self.bad = 0
+
+    def poll(self, on_value):
+        """Read whatever is waiting and call ``on_value(float)`` per complete line.
+
+        Returns the number of bytes read (0 if nothing was waiting).
+        """
+        n = self.uart.readinto(self.buf)
+        if not n:
+            return 0
+        buf = self.buf
+        for i in range(n):
+            self.feed(buf[i], on_value)
+        return n
+
+    def feed(self, b, on_value):
+        state = self.state
+        if b == 0x0A:                           # '\n' ends a line
+            if state == _NUM and self.digits:
+                v = self.acc / (self.div or 1)
+                self.lines += 1
+                on_value(-v if self.neg else v)
+            elif state == _NUM:
+                self.bad += 1
+            self.state = _SKIP
+        elif state == _SKIP:
+            if b == 0x3D:                       # '='
+                self.state = _NUM
+                self.acc = self.div = self.digits = 0
+                self.neg = False
+        elif 0x30 <= b <= 0x39:                 # digit
+            if self.digits < _MAX_DIGITS:
+                self.acc = self.acc * 10 + (b - 0x30)
+                self.digits += 1
+                if self.div:
+                    self.div *= 10
+        elif b == 0x2E and not self.div:        # '.'
+            self.div = 1
+        elif b == 0x2D and not self.digits:     # '-'
+            self.neg = True
+        elif b != 0x20 and b != 0x0D and b != 0x2B:   # ' ', '\r', '+' are fine
+            self.bad += 1                       # garbage: drop the rest of this line
+            self.state = _SKIP
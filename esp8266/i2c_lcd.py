@@ -15,6 +15,11 @@ MASK_E = 0x04
 SHIFT_BACKLIGHT = 3
 SHIFT_DATA = 4
 
+# Each byte sent to the LCD is 4 PCF8574 writes (high nibble E↑/E↓, low nibble
+# E↑/E↓).  A batch big enough for every cell of a 2x16 display plus a cursor
+# move per cell goes out as one writeto.
+BATCH_BYTES = 2 * 16 * 2 * 4
+
 
 class I2cLcd(LcdApi):
     """Implements a HD44780 character LCD connected via PCF8574 on I2C."""
@@ -22,6 +27,10 @@ class I2cLcd(LcdApi):
     def __init__(self, i2c, i2c_addr, num_lines, num_columns):
         self.i2c = i2c
         self.i2c_addr = i2c_addr
+        self._one = bytearray(4)               # a single command/data byte
+        self._batch = bytearray(BATCH_BYTES)   # queued bytes for hal_flush()
+        self._batch_mv = memoryview(self._batch)
+        self._queued = 0
         self.i2c.writeto(self.i2c_addr, bytearray([0]))
         sleep_ms(20)   # Allow LCD time to powerup
         # Send reset 3 times
@@ -57,26 +66,52 @@ class I2cLcd(LcdApi):
         """Allows the hal layer to turn the backlight off."""
         self.i2c.writeto(self.i2c_addr, bytearray([0]))
 
+    def _strobes(self, buf, i, rs, value):
+        """Fill buf[i:i+4] with the nibble strobes that send one byte."""
+        byte = rs | (self.backlight << SHIFT_BACKLIGHT) | (((value >> 4) & 0x0f) << SHIFT_DATA)
+        buf[i] = byte | MASK_E
+        buf[i + 1] = byte
+        byte = rs | (self.backlight << SHIFT_BACKLIGHT) | ((value & 0x0f) << SHIFT_DATA)
+        buf[i + 2] = byte | MASK_E
+        buf[i + 3] = byte
+
     def hal_write_command(self, cmd):
         """Writes a command to the LCD.
 
         Data is latched on the falling edge of E.
         """
-        byte = ((self.backlight << SHIFT_BACKLIGHT) | (((cmd >> 4) & 0x0f) << SHIFT_DATA))
-        self.i2c.writeto(self.i2c_addr, bytearray([byte | MASK_E]))
-        self.i2c.writeto(self.i2c_addr, bytearray([byte]))
-        byte = ((self.backlight << SHIFT_BACKLIGHT) | ((cmd & 0x0f) << SHIFT_DATA))
-        self.i2c.writeto(self.i2c_addr, bytearray([byte | MASK_E]))
-        self.i2c.writeto(self.i2c_addr, bytearray([byte]))
+        self.hal_flush()
+        self._strobes(self._one, 0, 0, cmd)
+        self.i2c.writeto(self.i2c_addr, self._one)
         if cmd <= 3:
             # The home and clear commands require a worst case delay of 4.1 msec
             sleep_ms(5)
 
     def hal_write_data(self, data):
         """Write data to the LCD."""
-        byte = (MASK_RS | (self.backlight << SHIFT_BACKLIGHT) | (((data >> 4) & 0x0f) << SHIFT_DATA))
-        self.i2c.writeto(self.i2c_addr, bytearray([byte | MASK_E]))
-        self.i2c.writeto(self.i2c_addr, bytearray([byte]))
-        byte = (MASK_RS | (self.backlight << SHIFT_BACKLIGHT) | ((data & 0x0f) << SHIFT_DATA))
-        self.i2c.writeto(self.i2c_addr, bytearray([byte | MASK_E]))
-        self.i2c.writeto(self.i2c_addr, bytearray([byte]))
\ No newline at end of file
+        self.hal_flush()
+        self._strobes(self._one, 0, MASK_RS, data)
+        self.i2c.writeto(self.i2c_addr, self._one)
+
+    def hal_queue_command(self, cmd):
+        """Queue a command; clear/home need a delay so they go out directly."""
+        if cmd <= 3:
+            self.hal_write_command(cmd)
+            return
+        self._queue(0, cmd)
+
+    def hal_queue_data(self, data):
+        """Queue a data byte for the next hal_flush()."""
+        self._queue(MASK_RS, data)
+
+    def _queue(self, rs, value):
+        if self._queued + 4 > BATCH_BYTES:
+            self.hal_flush()
+        self._strobes(self._batch, self._queued, rs, value)
+        self._queued += 4
+
+    def hal_flush(self):
+        """Send everything queued in a single I2C transaction."""
+        if self._queued:
+            self.i2c.writeto(self.i2c_addr, self._batch_mv[:self._queued])
+            self._queued = 0
@@ -150,9 +150,11 @@ class LcdApi:
             self.cursor_x = 0
             self.cursor_y += 1
             self.implied_newline = (char != '\n')
-        if self.cursor_y >= self.num_lines:
-            self.cursor_y = 0
-        self.move_to(self.cursor_x, self.cursor_y)
+            if self.cursor_y >= self.num_lines:
+                self.cursor_y = 0
+            # DDRAM rows aren't contiguous, so only a wrap needs an explicit
+            # move; otherwise the controller has already advanced the address.
+            self.move_to(self.cursor_x, self.cursor_y)
 
     def putstr(self, string):
         """Write the indicated string to the LCD at the current cursor
@@ -203,6 +205,23 @@ class LcdApi:
         """
         raise NotImplementedError
 
+    def hal_queue_command(self, cmd):
+        """Queue a command to be sent by the next hal_flush().
+
+        The default sends it straight away; a derived HAL class can
+        override this (and hal_queue_data/hal_flush) to batch a whole update
+        into a single bus transaction.
+        """
+        self.hal_write_command(cmd)
+
+    def hal_queue_data(self, data):
+        """Queue data to be sent by the next hal_flush()."""
+        self.hal_write_data(data)
+
+    def hal_flush(self):
+        """Send anything queued by hal_queue_command/hal_queue_data."""
+        pass
+
     # This is a default implementation of hal_sleep_us which is suitable
     # for most micropython implementations. For platforms which don't
     # support `time.sleep_us()` they should provide their own implementation
@@ -0,0 +1,98 @@
+"""Framebuffer layer for HD44780 character LCDs.
+
+Keeps a shadow copy of what's in the display's DDRAM.  Drawing only touches
+the back buffer; flush() diffs it against the shadow, sends just the cells
+that changed, skips the cursor move when a run continues where the previous
+one ended, and queues it all so an I2C HAL can send the whole update as a
+single transaction.
+"""
+
+SPACE = 0x20
+
+
+class LcdFrame:
+    def __init__(self, lcd):
+        self.lcd = lcd
+        self.cols = lcd.num_columns
+        self.lines = lcd.num_lines
+        n = self.cols * self.lines
+        self.want = bytearray(n)
+        self.shown = bytearray(n)
+        lcd.clear()                       # now we know the DDRAM is all spaces
+        for i in range(n):
+            self.want[i] = self.shown[i] = SPACE
+        self.cx = self.cy = 0             # where the controller's address points
+
+    def clear(self):
+        for i in range(len(self.want)):
+            self.want[i] = SPACE
+
+    def putstr(self, x, y, text):
+        """Draw ``text`` at (x, y); lines don't wrap."""
+        i, end = y * self.cols + x, (y + 1) * self.cols
+        for ch in text:
+            if i >= end:
+                break
+            self.want[i] = ord(ch)
+            i += 1
+
+    def put_number(self, x, y, value, width, decimals=1):
+        """Right-align ``value`` in ``width`` cells like '{:w.df}', without making a str."""
+        want, left = self.want, y * self.cols + x
+        i = left + width - 1
+        neg = value < 0
+        v = int((-value if neg else value) * 10 ** decimals + 0.5)
+        for d in range(decimals):
+            want[i] = 0x30 + v % 10
+            v //= 10
+            i -= 1
+        if decimals:
+            want[i] = 0x2E                # '.'
+            i -= 1
+        while True:
+            if i < left:                  # doesn't fit – show '#' like a meter would
+                for j in range(left, left + width):
+                    want[j] = 0x23
+                return
+            want[i] = 0x30 + v % 10
+            v //= 10
+            i -= 1
+            if not v:
+                break
+        if neg:
+            if i < left:
+                for j in range(left, left + width):
+                    want[j] = 0x23
+                return
+            want[i] = 0x2D
+            i -= 1
+        while i >= left:
+            want[i] = SPACE
+            i -= 1
+
+    def flush(self):
+        """Send changed cells; returns how many were written."""
+        lcd, cols = self.lcd, self.cols
+        want, shown = self.want, self.shown
+        written = 0
+        for y in range(self.lines):
+            base = y * cols
+            for x in range(cols):
+                i = base + x
+                c = want[i]
+                if c == shown[i]:
+                    continue
+                if x != self.cx or y != self.cy:
+                    addr = x & 0x3f
+                    if y & 1:
+                        addr += 0x40      # Lines 1 & 3 add 0x40
+                    if y & 2:             # Lines 2 & 3 add number of columns
+                        addr += cols
+                    lcd.hal_queue_command(lcd.LCD_DDRAM | addr)
+                lcd.hal_queue_data(c)
+                shown[i] = c
+                self.cx, self.cy = x + 1, y
+                written += 1
+        lcd.hal_flush()
+        lcd.cursor_x, lcd.cursor_y = self.cx, self.cy
+        return written
@@ -1,8 +1,13 @@
 from machine import Pin, I2C, UART, reset
-from time import ticks_us, ticks_diff, sleep_ms
+from time import ticks_us, ticks_ms, ticks_diff, sleep_ms
+from struct import pack_into
+from array import array
 from i2c_lcd import I2cLcd
+from lcd_frame import LcdFrame
 from ssd1306 import SSD1306_I2C
 from qrcode import display_qrcode
+from adc_reader import AdcReader
+import gc
 import uos
 
 
@@ -28,42 +33,152 @@ lcd_addr  = 0x27 if 0x27 in addr else 0x3f
 oled_addr = 0x3c if 0x3c in addr else 0x3d
 
 lcd  = I2cLcd(i2c, lcd_addr, 2, 16)
+frame = LcdFrame(lcd)   # shadow DDRAM: only changed cells hit the bus
 oled = SSD1306_I2C(128, 64, i2c, addr=oled_addr)
 
 display_qrcode(oled)
 
 # ---------- UART ----------
 # We're reading live grip strength data from the ADC display's TXD pin
-uart = UART(0, baudrate=9600, rx=3, tx=1)
+# rxbuf gives us slack so a slow LCD write can't overrun the hardware FIFO
+uart = UART(0, baudrate=9600, rx=3, tx=1, rxbuf=256)
+adc = AdcReader(uart)
+
+# ---------- GC budget ----------
+# Steady state allocates next to nothing, but collect on our own schedule
+# (between frames) when free heap gets low rather than mid-frame.
+GC_EVERY_MS = 1000
+GC_MIN_FREE = 8 * 1024
 
+# ---------- Scheduler ----------
+# Sampling + forwarding to the Pi run for every line the ADC sends; the LCD
+# only redraws the newest value at most every RENDER_EVERY_MS, and waits for
+# a gap in the input unless it's fallen a whole extra period behind.
+RENDER_EVERY_MS = 100
+STATS_EVERY_MS = 5000
 
-def lcd_update(current_grip, max_grip, _lcd: I2cLcd):
-    _lcd.move_to(7, 0); _lcd.putstr("{:6.1f}".format(float(current_grip)))
-    _lcd.move_to(7, 1); _lcd.putstr("{:6.1f}".format(float(max_grip)))
+# on-device counters, reported to the Pi as a '#GRIP …' status line
+rx = 0          # samples parsed from the ADC
+fwd = 0         # samples sent to the Pi
+skipped = 0     # samples superseded before the LCD showed them
+frames = 0      # LCD redraws
 
 
-def main():
-    buf = b''
-    max_grip = 0.0
-    lcd.clear()
-    lcd.putstr(" Grip :\n Max  :")
+# ---------- Pi link framing ----------
+# BINARY = True sends fixed 12-byte frames instead of "CUR@MAX\n" text:
+#   <B 0xA5> <B seq> <I ticks_us> <H cur*100> <H max*100> <H crc16>
+# (parsed by BinaryFrameParser in pi/ingest.py).  ticks_us goes out as-is, so
+# it wraps at 2**30 like ticks_us() itself; the Pi masks gaps to 30 bits.  The Pi can't answer us –
+# UART0 RX is wired to the ADC display – so we announce the mode with HELLO at
+# boot and every HELLO_EVERY_MS; a Pi that never sees it keeps parsing text.
+BINARY = True
+HELLO = b"\nGRIP BIN1\n"
+HELLO_EVERY_MS = 2000
 
-    while True:
-        if uart.any():
-            buf += uart.read()
-            sbuf = str(buf)
+_frame = bytearray(12)
+_seq = 0
+
+
+def _crc_table():
+    # CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) – binascii.crc_hqx on the Pi
+    t = array("H", [0] * 256)
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        t[i] = crc & 0xFFFF
+    return t
+
+
+CRC_TABLE = _crc_table()
+
+
+def crc16(buf, n):
+    crc = 0xFFFF
+    for i in range(n):
+        crc = ((crc << 8) & 0xFFFF) ^ CRC_TABLE[((crc >> 8) ^ buf[i]) & 0xFF]
+    return crc
+
+
+def _scaled(value):
+    v = int(value * 100 + 0.5)
+    return 0 if v < 0 else 65535 if v > 65535 else v
 
-            sbuf = sbuf[:-5]
-            _, value = sbuf.split("=")
 
-            if float(value) >= max_grip:
-                max_grip = float(value)
+def send_sample(current_grip, max_grip):
+    global _seq, fwd
+    fwd += 1
+    if not BINARY:
+        uart.write("{:.2f}@{:.2f}\n".format(current_grip, max_grip))
+        return
+    pack_into("<BBIHH", _frame, 0, 0xA5, _seq, ticks_us(), _scaled(current_grip), _scaled(max_grip))
+    pack_into("<H", _frame, 10, crc16(_frame, 10))
+    uart.write(_frame)
+    _seq = (_seq + 1) & 0xFF
 
-            lcd_update(value, max_grip, lcd)
-            uart.write("{:.2f}@{:.2f}\n".format(float(value), max_grip))
-            buf = b''
 
-        sleep_ms(10)
+def send_stats():
+    # one small str every few seconds; parsed by pi/ingest.py (parse_status)
+    uart.write("\n#GRIP rx={} fwd={} bad={} skip={} frames={}\n".format(
+        rx, fwd, adc.bad, skipped, frames))
+
+
+def lcd_update(current_grip, max_grip, _frame: LcdFrame):
+    _frame.put_number(7, 0, current_grip, 6)
+    _frame.put_number(7, 1, max_grip, 6)
+    _frame.flush()            # one I2C transaction, changed cells only
+
+
+max_grip = 0.0
+latest = 0.0
+dirty = False   # a sample has arrived since the last redraw
+
+
+def on_value(value):
+    global max_grip, latest, dirty, rx, skipped
+    rx += 1
+    if value >= max_grip:
+        max_grip = value
+    send_sample(value, max_grip)      # the Pi always gets every sample
+    if dirty:
+        skipped += 1
+    latest, dirty = value, True
+
+
+def main():
+    global dirty, frames
+    frame.clear()
+    frame.putstr(0, 0, " Grip :")
+    frame.putstr(0, 1, " Max  :")
+    frame.flush()
+    gc.collect()
+    last_hello = last_gc = last_render = last_stats = ticks_ms()
+    if BINARY:
+        uart.write(HELLO)
+
+    while True:
+        got = adc.poll(on_value)
+
+        now = ticks_ms()
+        since = ticks_diff(now, last_render)
+        if dirty and since >= RENDER_EVERY_MS and (not uart.any() or since >= 2 * RENDER_EVERY_MS):
+            lcd_update(latest, max_grip, frame)
+            dirty = False
+            frames += 1
+            last_render = now
+        if BINARY and ticks_diff(now, last_hello) >= HELLO_EVERY_MS:
+            uart.write(HELLO)
+            last_hello = now
+        if ticks_diff(now, last_stats) >= STATS_EVERY_MS:
+            send_stats()
+            last_stats = now
+        if ticks_diff(now, last_gc) >= GC_EVERY_MS:
+            if gc.mem_free() < GC_MIN_FREE:
+                gc.collect()
+            last_gc = now
+
+        if not got:
+            sleep_ms(1)           # nothing waiting; yield briefly
 
 
 try:
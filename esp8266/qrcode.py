@@ -1,46 +1,72 @@
+import framebuf
 from ssd1306 import SSD1306_I2C
 
 
 # points folks at http://gripper.local
-qrcode = [
-    "000000001111111111111100000011000000111100001111111111111100000000",
-    "000000001100000000001100111111000011001100001100000000001100000000",
-    "000000001100111111001100110000000000111100001100111111001100000000",
-    "000000001100111111001100001100001100110000001100111111001100000000",
-    "000000001100111111001100111111001111111111001100111111001100000000",
-    "000000001100000000001100110011001111111100001100000000001100000000",
-    "000000001111111111111100110011001100110011001111111111111100000000",
-    "000000000000000000000000110011110000111100000000000000000000000000",
-    "000000001111001100001111000000111111111111001111110011110000000000",
-    "000000001111001111000000001100111100000011111100000000001100000000",
-    "000000000011110000001111110000111111000000000011000000111100000000",
-    "000000000000001111110011001111111111110011110011110000000000000000",
-    "000000001100000011111100000011110000111111111111001100111100000000",
-    "000000000000001111000000001100110011000011001111001111001100000000",
-    "000000001100110011111111000011110011110011111111110011001100000000",
-    "000000000011111111110011110011110000000000110000001100110000000000",
-    "000000001111001111001111110011001111000011111111111111000000000000",
-    "000000000000000000000000110011001111110011000000111111001100000000",
-    "000000001111111111111100110000111100111111001100110000111100000000",
-    "000000001100000000001100000000001100110011000000111111110000000000",
-    "000000001100111111001100001100000000000011111111110000001100000000",
-    "000000001100111111001100111100110000110000000011110011000000000000",
-    "000000001100111111001100000011000000001100110000111111001100000000",
-    "000000001100000000001100111100000000111111000000001100000000000000",
-    "000000001111111111111100111100001100001111001111000000111100000000",
-]
+# 1 bit per pixel, pre-scaled, MONO_HLSB – regenerate with scripts/qr-helper.py
+QR_WIDTH = 128
+QR_HEIGHT = 50
+QR_BITMAP = (
+    b"\x00\x00\xff\xff\xff\xf0\x00\xf0\x00\xff\x00\xff\xff\xff\xf0\x00"
+    b"\x00\x00\xff\xff\xff\xf0\x00\xf0\x00\xff\x00\xff\xff\xff\xf0\x00"
+    b"\x00\x00\xf0\x00\x00\xf0\xff\xf0\x0f\x0f\x00\xf0\x00\x00\xf0\x00"
+    b"\x00\x00\xf0\x00\x00\xf0\xff\xf0\x0f\x0f\x00\xf0\x00\x00\xf0\x00"
+    b"\x00\x00\xf0\xff\xf0\xf0\xf0\x00\x00\xff\x00\xf0\xff\xf0\xf0\x00"
+    b"\x00\x00\xf0\xff\xf0\xf0\xf0\x00\x00\xff\x00\xf0\xff\xf0\xf0\x00"
+    b"\x00\x00\xf0\xff\xf0\xf0\x0f\x00\xf0\xf0\x00\xf0\xff\xf0\xf0\x00"
+    b"\x00\x00\xf0\xff\xf0\xf0\x0f\x00\xf0\xf0\x00\xf0\xff\xf0\xf0\x00"
+    b"\x00\x00\xf0\xff\xf0\xf0\xff\xf0\xff\xff\xf0\xf0\xff\xf0\xf0\x00"
+    b"\x00\x00\xf0\xff\xf0\xf0\xff\xf0\xff\xff\xf0\xf0\xff\xf0\xf0\x00"
+    b"\x00\x00\xf0\x00\x00\xf0\xf0\xf0\xff\xff\x00\xf0\x00\x00\xf0\x00"
+    b"\x00\x00\xf0\x00\x00\xf0\xf0\xf0\xff\xff\x00\xf0\x00\x00\xf0\x00"
+    b"\x00\x00\xff\xff\xff\xf0\xf0\xf0\xf0\xf0\xf0\xff\xff\xff\xf0\x00"
+    b"\x00\x00\xff\xff\xff\xf0\xf0\xf0\xf0\xf0\xf0\xff\xff\xff\xf0\x00"
+    b"\x00\x00\x00\x00\x00\x00\xf0\xff\x00\xff\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\xf0\xff\x00\xff\x00\x00\x00\x00\x00\x00"
+    b"\x00\x00\xff\x0f\x00\xff\x00\x0f\xff\xff\xf0\xff\xf0\xff\x00\x00"
+    b"\x00\x00\xff\x0f\x00\xff\x00\x0f\xff\xff\xf0\xff\xf0\xff\x00\x00"
+    b"\x00\x00\xff\x0f\xf0\x00\x0f\x0f\xf0\x00\xff\xf0\x00\x00\xf0\x00"
+    b"\x00\x00\xff\x0f\xf0\x00\x0f\x0f\xf0\x00\xff\xf0\x00\x00\xf0\x00"
+    b"\x00\x00\x0f\xf0\x00\xff\xf0\x0f\xff\x00\x00\x0f\x00\x0f\xf0\x00"
+    b"\x00\x00\x0f\xf0\x00\xff\xf0\x0f\xff\x00\x00\x0f\x00\x0f\xf0\x00"
+    b"\x00\x00\x00\x0f\xff\x0f\x0f\xff\xff\xf0\xff\x0f\xf0\x00\x00\x00"
+    b"\x00\x00\x00\x0f\xff\x0f\x0f\xff\xff\xf0\xff\x0f\xf0\x00\x00\x00"
+    b"\x00\x00\xf0\x00\xff\xf0\x00\xff\x00\xff\xff\xff\x0f\x0f\xf0\x00"
+    b"\x00\x00\xf0\x00\xff\xf0\x00\xff\x00\xff\xff\xff\x0f\x0f\xf0\x00"
+    b"\x00\x00\x00\x0f\xf0\x00\x0f\x0f\x0f\x00\xf0\xff\x0f\xf0\xf0\x00"
+    b"\x00\x00\x00\x0f\xf0\x00\x0f\x0f\x0f\x00\xf0\xff\x0f\xf0\xf0\x00"
+    b"\x00\x00\xf0\xf0\xff\xff\x00\xff\x0f\xf0\xff\xff\xf0\xf0\xf0\x00"
+    b"\x00\x00\xf0\xf0\xff\xff\x00\xff\x0f\xf0\xff\xff\xf0\xf0\xf0\x00"
+    b"\x00\x00\x0f\xff\xff\x0f\xf0\xff\x00\x00\x0f\x00\x0f\x0f\x00\x00"
+    b"\x00\x00\x0f\xff\xff\x0f\xf0\xff\x00\x00\x0f\x00\x0f\x0f\x00\x00"
+    b"\x00\x00\xff\x0f\xf0\xff\xf0\xf0\xff\x00\xff\xff\xff\xf0\x00\x00"
+    b"\x00\x00\xff\x0f\xf0\xff\xf0\xf0\xff\x00\xff\xff\xff\xf0\x00\x00"
+    b"\x00\x00\x00\x00\x00\x00\xf0\xf0\xff\xf0\xf0\x00\xff\xf0\xf0\x00"
+    b"\x00\x00\x00\x00\x00\x00\xf0\xf0\xff\xf0\xf0\x00\xff\xf0\xf0\x00"
+    b"\x00\x00\xff\xff\xff\xf0\xf0\x0f\xf0\xff\xf0\xf0\xf0\x0f\xf0\x00"
+    b"\x00\x00\xff\xff\xff\xf0\xf0\x0f\xf0\xff\xf0\xf0\xf0\x0f\xf0\x00"
+    b"\x00\x00\xf0\x00\x00\xf0\x00\x00\xf0\xf0\xf0\x00\xff\xff\x00\x00"
+    b"\x00\x00\xf0\x00\x00\xf0\x00\x00\xf0\xf0\xf0\x00\xff\xff\x00\x00"
+    b"\x00\x00\xf0\xff\xf0\xf0\x0f\x00\x00\x00\xff\xff\xf0\x00\xf0\x00"
+    b"\x00\x00\xf0\xff\xf0\xf0\x0f\x00\x00\x00\xff\xff\xf0\x00\xf0\x00"
+    b"\x00\x00\xf0\xff\xf0\xf0\xff\x0f\x00\xf0\x00\x0f\xf0\xf0\x00\x00"
+    b"\x00\x00\xf0\xff\xf0\xf0\xff\x0f\x00\xf0\x00\x0f\xf0\xf0\x00\x00"
+    b"\x00\x00\xf0\xff\xf0\xf0\x00\xf0\x00\x0f\x0f\x00\xff\xf0\xf0\x00"
+    b"\x00\x00\xf0\xff\xf0\xf0\x00\xf0\x00\x0f\x0f\x00\xff\xf0\xf0\x00"
+    b"\x00\x00\xf0\x00\x00\xf0\xff\x00\x00\xff\xf0\x00\x0f\x00\x00\x00"
+    b"\x00\x00\xf0\x00\x00\xf0\xff\x00\x00\xff\xf0\x00\x0f\x00\x00\x00"
+    b"\x00\x00\xff\xff\xff\xf0\xff\x00\xf0\x0f\xf0\xff\x00\x0f\xf0\x00"
+    b"\x00\x00\xff\xff\xff\xf0\xff\x00\xf0\x0f\xf0\xff\x00\x0f\xf0\x00"
+)
+
 
 def display_qrcode(oled: SSD1306_I2C):
     oled.fill(0)
 
-    scale = 2
     left = 0
-    top = (64 - len(qrcode) * scale) // 2
+    top = (64 - QR_HEIGHT) // 2
 
-    for y, row in enumerate(qrcode):
-        for x, ch in enumerate(row):
-            if ch == "1":
-                oled.fill_rect(left + x * scale,
-                               top + y * scale,
-                               scale, scale, 1)
-    oled.show()
\ No newline at end of file
+    # FrameBuffer wants a writable buffer; this is the only copy we make
+    qr = framebuf.FrameBuffer(bytearray(QR_BITMAP), QR_WIDTH, QR_HEIGHT, framebuf.MONO_HLSB)
+    oled.blit(qr, left, top)
+    oled.show()
@@ -0,0 +1,108 @@
+# assets.py  –  static files and rendered pages, encoded once, served from memory
+#
+# At startup every file under static/ is read, given a content-hashed name
+# (app.js -> app.3f9c0a1b2d.js) and compressed with gzip and, if the brotli
+# module is installed, brotli.  Pages link the hashed names, so those can be
+# cached forever; the page itself is rendered once per (user, side) and kept
+# with its encodings and an ETag, so a kiosk reload is a single 304.
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+
+try:
+    import brotli
+except ImportError:       # gzip only
+    brotli = None
+
+COMPRESSIBLE = ("text/", "application/javascript", "application/json", "image/svg+xml")
+ENCODINGS = ("br", "gzip", "identity")   # server preference, best first
+
+
+class Encoded:
+    """One response body in every encoding worth sending, plus its ETag."""
+
+    __slots__ = ("mimetype", "etag", "bodies")
+
+    def __init__(self, raw, mimetype, min_size=256):
+        self.mimetype = mimetype
+        self.etag = hashlib.sha1(raw).hexdigest()[:16]
+        self.bodies = {"identity": raw}
+        if len(raw) >= min_size and mimetype.startswith(COMPRESSIBLE):
+            self._add("gzip", gzip.compress(raw, 9, mtime=0))
+            if brotli is not None:
+                self._add("br", brotli.compress(raw, quality=11))
+
+    def _add(self, encoding, body):
+        if len(body) < len(self.bodies["identity"]):
+            self.bodies[encoding] = body
+
+    def pick(self, accept_encodings):
+        """(encoding, body) for a werkzeug Accept-Encoding header."""
+        offered = [e for e in ENCODINGS if e in self.bodies]
+        encoding = accept_encodings.best_match(offered, default="identity")
+        return encoding, self.bodies[encoding]
+
+    @property
+    def varies(self):
+        return len(self.bodies) > 1
+
+
+class AssetPipeline:
+    def __init__(self, root):
+        self.root = root
+        self.by_name = {}      # "app.js"            -> (hashed name, Encoded)
+        self.by_hash = {}      # "app.3f9c0a1b2d.js" -> Encoded
+        for dirpath, _, files in os.walk(root):
+            for fn in sorted(files):
+                path = os.path.join(dirpath, fn)
+                self._add(os.path.relpath(path, root).replace(os.sep, "/"), path)
+
+    def _add(self, name, path):
+        with open(path, "rb") as f:
+            raw = f.read()
+        mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if mimetype.startswith("text/") or mimetype == "application/javascript":
+            mimetype += "; charset=utf-8"
+        enc = Encoded(raw, mimetype)
+        stem, ext = os.path.splitext(name)
+        hashed = f"{stem}.{enc.etag[:10]}{ext}"
+        self.by_name[name] = (hashed, enc)
+        self.by_hash[hashed] = enc
+
+    def url(self, name):
+        """The cache-forever URL for a static file (plain /static/ if it's missing)."""
+        hashed = self.by_name.get(name, (name,))[0]
+        return f"/static/{hashed}"
+
+    def get(self, name):
+        """(Encoded, immutable) for a hashed or plain name, or (None, False)."""
+        enc = self.by_hash.get(name)
+        if enc is not None:
+            return enc, True
+        return self.by_name.get(name, (None, None))[1], False
+
+    def stats(self):
+        return {name: {enc: len(b) for enc, b in e.bodies.items()}
+                for name, (_, e) in self.by_name.items()}
+
+
+class PageCache:
+    """Rendered pages keyed by whatever they depend on, e.g. (device, user, side)."""
+
+    def __init__(self, render, limit=256):
+        self.render = render       # key -> str; runs inside the request
+        self.limit = limit         # user names come from the kiosk, so bound it
+        self.pages = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        page = self.pages.get(key)
+        if page is None:
+            page = Encoded(self.render(*key).encode(), "text/html; charset=utf-8")
+            with self._lock:
+                if len(self.pages) >= self.limit:
+                    self.pages.clear()
+                self.pages[key] = page
+        return page
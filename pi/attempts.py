@@ -0,0 +1,60 @@
+# attempts.py  –  streaming rep detector on the ingest path
+#
+# A rep starts when the reading rises to ``onset`` lbs and ends when it falls
+# back to ``release`` (onset > release, so noise around one threshold can't
+# chatter).  While a rep is open the detector keeps its peak, time to peak and
+# impulse (trapezoidal lbs·s) as running values, so each sample is a couple of
+# compares and one multiply-add; the finished rep is handed to ``on_attempt``.
+from typing import NamedTuple
+
+
+class Attempt(NamedTuple):
+    start: float
+    end: float
+    peak: float
+    time_to_peak: float   # s from onset
+    impulse: float        # lbs·s above zero, onset to release
+    n: int
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+
+class AttemptDetector:
+    __slots__ = ("on_attempt", "onset", "release", "min_duration",
+                 "active", "start", "peak", "peak_t", "impulse", "n", "last_t", "last_v")
+
+    def __init__(self, on_attempt, onset=5.0, release=2.0, min_duration=0.3):
+        """``on_attempt(Attempt)`` runs on the ingest thread, so it must not block."""
+        if release >= onset:
+            raise ValueError("release threshold must be below onset")
+        self.on_attempt = on_attempt
+        self.onset = onset
+        self.release = release
+        self.min_duration = min_duration   # shorter blips (a knock, a glitch) are dropped
+        self.active = False
+        self.last_t = self.last_v = 0.0
+
+    def add(self, t, v):
+        if self.active:
+            self.impulse += (v + self.last_v) * 0.5 * (t - self.last_t)
+            self.n += 1
+            if v > self.peak:
+                self.peak, self.peak_t = v, t
+            elif v <= self.release:
+                self.active = False
+                if t - self.start >= self.min_duration:
+                    self.on_attempt(Attempt(self.start, t, self.peak, self.peak_t - self.start,
+                                            self.impulse, self.n))
+        elif v >= self.onset:
+            self.active = True
+            self.start = self.peak_t = t
+            self.peak = v
+            self.impulse = 0.0
+            self.n = 1
+        self.last_t, self.last_v = t, v
+
+    def reset(self):
+        """Forget an open rep, e.g. when the board was reset mid-squeeze."""
+        self.active = False
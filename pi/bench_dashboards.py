@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# bench_dashboards.py  –  time the provisioned Grafana dashboards' Flux queries
+#
+#   $ export INFLUX_TOKEN=…
+#   $ python bench_dashboards.py --url http://gripper.local:8086
+#   $ python bench_dashboards.py --rev HEAD~1 --save before.json   # dashboards as of a commit
+#   $ python bench_dashboards.py --compare before.json            # … against the current ones
+#
+# Runs every panel and template-variable query the way Grafana would for a
+# ladder of time ranges: v.timeRangeStart/Stop set, v.windowPeriod for a
+# --points wide panel, $variables matching everything.  Each query runs
+# --repeat times; the median counts.  Reports, per dashboard and range, the
+# summed query time (what InfluxDB spends on one dashboard load), the slowest
+# panel and how many rows came back.
+#
+# --compare prints before/after side by side and exits 1 when a dashboard
+# got slower than the baseline by more than --tolerance and --slack-ms.
+import argparse
+import datetime
+import glob
+import http.client
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DASHBOARDS = "grafana-provisioning/dashboards"
+
+UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400, "y": 365 * 86400}
+# what Grafana rounds its auto interval to (seconds)
+NICE = (1, 5, 10, 15, 20, 30, 60, 120, 300, 600, 900, 1200, 1800, 3600, 7200, 10800,
+        21600, 43200, 86400, 7 * 86400, 30 * 86400)
+
+
+def seconds(spec):
+    return int(spec[:-1]) * UNITS[spec[-1]]
+
+
+# ---------- dashboards ----------------------------------------------------
+def load_dashboards(rev=None):
+    """{file name: dashboard JSON}, from the tree or from a git revision."""
+    if rev is None:
+        return {os.path.basename(p): json.load(open(p))
+                for p in sorted(glob.glob(os.path.join(HERE, DASHBOARDS, "*.json")))}
+    git = lambda *a: subprocess.run(["git", *a], cwd=HERE, check=True,
+                                    capture_output=True, text=True).stdout
+    out = {}
+    for path in git("ls-tree", "--name-only", rev, f"{DASHBOARDS}/").split():   # cwd-relative
+        if path.endswith(".json"):
+            out[os.path.basename(path)] = json.loads(git("show", f"{rev}:./{path}"))
+    return out
+
+
+def flux_queries(dash):
+    """[(label, flux)] for every InfluxDB panel target and template variable."""
+    def panels(items):
+        for p in items:
+            yield p
+            yield from panels(p.get("panels", []))
+
+    out = []
+    for p in panels(dash.get("panels", [])):
+        for t in p.get("targets") or []:
+            q = t.get("query")
+            if isinstance(q, str) and ("from(" in q or "schema." in q):
+                out.append((f"{p.get('title', '?')} [{t.get('refId', 'A')}]", q))
+    for v in dash.get("templating", {}).get("list", []):
+        q = v.get("query")
+        q = q.get("query") if isinstance(q, dict) else q
+        if v.get("type") == "query" and isinstance(q, str) and ("from(" in q or "schema." in q):
+            out.append((f"${v['name']}", q))
+    return out
+
+
+def window_period(range_s, points):
+    raw = max(range_s / points, 1)
+    return next((n for n in NICE if n >= raw), NICE[-1])
+
+
+def bind(flux, start, stop, every_s):
+    """The query with Grafana's v record and match-all $variables filled in."""
+    flux = flux.replace("\r\n", "\n")
+    flux = re.sub(r"\$\{\w+(:\w+)?\}|\$\w+", ".*", flux)
+    lines = flux.split("\n")
+    n = 0
+    while n < len(lines) and (lines[n].startswith("import ") or not lines[n].strip()):
+        n += 1
+    v = (f"option v = {{timeRangeStart: {start:%Y-%m-%dT%H:%M:%SZ}, "
+         f"timeRangeStop: {stop:%Y-%m-%dT%H:%M:%SZ}, windowPeriod: {every_s}s, "
+         f'defaultBucket: "grip"}}')
+    return "\n".join(lines[:n] + [v, ""] + lines[n:])
+
+
+# ---------- InfluxDB ------------------------------------------------------
+class Influx:
+    def __init__(self, url, token, org):
+        u = urlsplit(url)
+        self.host, self.port = u.hostname, u.port or 8086
+        self.headers = {"Authorization": f"Token {token}", "Content-Type": "application/json",
+                        "Accept": "application/csv"}
+        self.path = f"/api/v2/query?org={org}"
+
+    def query(self, flux):
+        """(ms, rows, error) for one query; the body is read to the end."""
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=300)
+        try:
+            t0 = time.perf_counter()
+            conn.request("POST", self.path, body=json.dumps(
+                {"query": flux, "type": "flux", "dialect": {"annotations": []}}),
+                headers=self.headers)
+            r = conn.getresponse()
+            body = r.read()
+            ms = (time.perf_counter() - t0) * 1000
+        finally:
+            conn.close()
+        if r.status != 200:
+            return ms, 0, body.decode(errors="replace").strip()[:200]
+        rows = sum(1 for line in body.splitlines() if line.strip() and not line.startswith(b",result"))
+        return ms, rows, None
+
+
+# ---------- run -----------------------------------------------------------
+def bench(influx, dashboards, ranges, points, repeat):
+    stop = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+    results = []
+    for name, dash in dashboards.items():
+        queries = flux_queries(dash)
+        if not queries:
+            continue
+        for rng in ranges:
+            range_s = seconds(rng)
+            start = stop - datetime.timedelta(seconds=range_s)
+            every = window_period(range_s, points)
+            panels = []
+            for label, flux in queries:
+                flux = bind(flux, start, stop, every)
+                runs = [influx.query(flux) for _ in range(repeat)]
+                errors = [e for _, _, e in runs if e]
+                panels.append({"panel": label, "ms": statistics.median(ms for ms, _, _ in runs),
+                               "rows": runs[-1][1], "error": errors[0] if errors else None})
+            slowest = max(panels, key=lambda p: p["ms"])
+            results.append({"dashboard": name, "range": rng,
+                            "total_ms": sum(p["ms"] for p in panels),
+                            "slowest_ms": slowest["ms"], "slowest": slowest["panel"],
+                            "rows": sum(p["rows"] for p in panels),
+                            "errors": sum(1 for p in panels if p["error"]),
+                            "panels": panels})
+            r = results[-1]
+            print(f"{name:<22} {rng:>5}  {r['total_ms']:9.0f} ms  {r['rows']:8d} rows  "
+                  f"slowest {r['slowest_ms']:7.0f} ms {r['slowest']}"
+                  + (f"  ({r['errors']} failed)" if r["errors"] else ""), flush=True)
+    return results
+
+
+def compare(results, baseline, tolerance, slack_ms):
+    base = {(r["dashboard"], r["range"]): r for r in baseline}
+    worse = []
+    print(f"\n{'dashboard':<22} {'range':>5}  {'before ms':>10}  {'after ms':>10}  {'speedup':>7}")
+    for r in results:
+        b = base.get((r["dashboard"], r["range"]))
+        if b is None:
+            continue
+        speedup = b["total_ms"] / r["total_ms"] if r["total_ms"] else float("inf")
+        print(f"{r['dashboard']:<22} {r['range']:>5}  {b['total_ms']:10.0f}  "
+              f"{r['total_ms']:10.0f}  {speedup:6.1f}x")
+        if (r["total_ms"] - b["total_ms"] > slack_ms
+                and (r["total_ms"] - b["total_ms"]) / b["total_ms"] > tolerance):
+            worse.append(f"{r['dashboard']} {r['range']}: "
+                         f"{b['total_ms']:.0f} -> {r['total_ms']:.0f} ms")
+    return worse
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Time the provisioned dashboards' Flux queries.")
+    ap.add_argument("--url", default=os.getenv("INFLUX_URL", "http://localhost:8086"))
+    ap.add_argument("--org", default="grip")
+    ap.add_argument("--ranges", default="1h,24h,7d,30d,365d")
+    ap.add_argument("--points", type=int, default=1000, help="panel width in data points")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--dashboard", action="append", help="only these files (repeatable)")
+    ap.add_argument("--rev", help="read the dashboards from this git revision")
+    ap.add_argument("--errors", action="store_true", help="print each failing query's error")
+    ap.add_argument("--save", help="write results as JSON")
+    ap.add_argument("--compare", help="baseline JSON from --save; exit 1 on regressions")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    ap.add_argument("--slack-ms", type=float, default=50)
+    args = ap.parse_args()
+
+    token = os.getenv("INFLUX_TOKEN")
+    if not token:
+        sys.exit("set INFLUX_TOKEN")
+    dashboards = load_dashboards(args.rev)
+    if args.dashboard:
+        dashboards = {k: v for k, v in dashboards.items() if k in args.dashboard}
+    results = bench(Influx(args.url, token, args.org), dashboards,
+                    args.ranges.split(","), args.points, args.repeat)
+    if args.errors:
+        for r in results:
+            for p in r["panels"]:
+                if p["error"]:
+                    print(f"{r['dashboard']} {r['range']} {p['panel']}: {p['error']}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            worse = compare(results, json.load(f), args.tolerance, args.slack_ms)
+        for w in worse:
+            print("REGRESSION", w)
+        sys.exit(1 if worse else 0)
+
+
+if __name__ == "__main__":
+    main()
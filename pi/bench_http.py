@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# bench_http.py  –  load test /, /data, /meta and /savemax; reports req/s + latency
+#
+#   $ python bench_http.py --url http://gripper.local --clients 8 --seconds 10
+#
+# Run it once against the dev server (python grip_server.py) and once against
+# gunicorn (gunicorn -c gunicorn.conf.py grip_server:app) to compare.
+# /meta always re-sends the current side so it never pulses DTR; /savemax
+# writes go to the 'loadtest' user so they're easy to delete afterwards.
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+ENDPOINTS = {
+    "page":    ("GET",  "/", None),
+    "data":    ("GET",  "/data", None),
+    "meta":    ("POST", "/meta", {"name": "loadtest", "side": "right"}),
+    "savemax": ("POST", "/savemax", {"name": "loadtest", "side": "right", "value": 1.0}),
+}
+
+
+def worker(host, port, method, path, body, deadline, out):
+    conn = http.client.HTTPConnection(host, port, timeout=10)   # keep-alive, like a browser
+    payload = json.dumps(body) if body is not None else None
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    headers["Accept-Encoding"] = "br, gzip"                     # as a browser would
+    lat, errors = [], 0
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            r = conn.getresponse()
+            r.read()
+            if r.status >= 400:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=10)
+            continue
+        lat.append(time.perf_counter() - t0)
+    conn.close()
+    out.append((lat, errors))
+
+
+def run(url, name, clients, seconds):
+    u = urlsplit(url)
+    method, path, body = ENDPOINTS[name]
+    deadline = time.perf_counter() + seconds
+    out = []
+    threads = [threading.Thread(target=worker, args=(u.hostname, u.port or 80, method,
+                                                      path, body, deadline, out))
+               for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    lat = sorted(x for l, _ in out for x in l)
+    errors = sum(e for _, e in out)
+    if not lat:
+        print(f"{name:8s} no successful requests ({errors} errors)")
+        return
+    p = lambda q: lat[min(len(lat) - 1, int(q * len(lat)))] * 1000
+    print(f"{name:8s} {len(lat) / seconds:8.0f} req/s   p50 {p(.5):6.1f} ms   "
+          f"p99 {p(.99):6.1f} ms   mean {statistics.fmean(lat) * 1000:6.1f} ms   "
+          f"errors {errors}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Load test grip_server endpoints.")
+    ap.add_argument("--url", default="http://localhost:80")
+    ap.add_argument("--clients", type=int, default=8)
+    ap.add_argument("--seconds", type=float, default=10)
+    ap.add_argument("endpoints", nargs="*", help=f"any of {', '.join(ENDPOINTS)} (default: all)")
+    args = ap.parse_args()
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        ap.error(f"unknown endpoint(s): {', '.join(sorted(unknown))}")
+    for name in args.endpoints or ENDPOINTS:
+        run(args.url, name, args.clients, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
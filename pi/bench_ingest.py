@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# bench_ingest.py  –  sustained throughput + idle cost of the serial ingest engine
+#
+#   $ python bench_ingest.py --frames 200000
+#   $ python bench_ingest.py --rate 960        # ~9600 baud worth of frames
+#   $ python bench_ingest.py --devices 4       # four ports on one IngestGroup
+import argparse
+import resource
+import threading
+import time
+
+from fake_serial import PtySerial, synthetic_frames
+from ingest import IngestGroup, SerialIngest
+
+
+def cpu():
+    r = resource.getrusage(resource.RUSAGE_SELF)
+    return r.ru_utime + r.ru_stime
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--frames", type=int, default=100_000)
+    ap.add_argument("--rate", type=float, default=None, help="frames/s (default: flat out)")
+    ap.add_argument("--idle", type=float, default=2.0, help="seconds to measure idle CPU")
+    ap.add_argument("--devices", type=int, default=1,
+                    help="ports read by one IngestGroup thread (--frames each)")
+    args = ap.parse_args()
+
+    devs = [PtySerial() for _ in range(args.devices)]
+    seen = [0]
+
+    def on_sample(cur, m):
+        seen[0] += 1
+
+    engines = [SerialIngest(d, on_sample) for d in devs]
+    if args.devices == 1:
+        engines[0].start()
+        runner = engines[0]
+    else:
+        runner = IngestGroup()
+        for eng in engines:
+            runner.add(eng)
+        runner.start()
+
+    c0, t0 = cpu(), time.perf_counter()
+    time.sleep(args.idle)
+    idle_cpu = cpu() - c0
+    print(f"idle      : {idle_cpu / args.idle * 100:.2f}% CPU over {args.idle:.1f}s")
+
+    c0, t0 = cpu(), time.perf_counter()
+    sent = [0] * len(devs)
+
+    def pump(i):
+        sent[i] = devs[i].pump(synthetic_frames(args.frames), rate=args.rate)
+
+    writers = [threading.Thread(target=pump, args=(i,)) for i in range(len(devs))]
+    for w in writers:
+        w.start()
+    for w in writers:
+        w.join()
+    while seen[0] < sum(sent) and time.perf_counter() - t0 < 60:
+        time.sleep(0.001)
+    wall, used = time.perf_counter() - t0, cpu() - c0
+
+    errors = sum(e.parser.errors for e in engines)
+    overruns = sum(e.overruns for e in engines)
+    nbytes = sum(e.bytes_read for e in engines)
+    print(f"frames    : {seen[0]}/{sum(sent)} parsed, {errors} errors, {overruns} overruns")
+    print(f"throughput: {seen[0] / wall:,.0f} frames/s, {nbytes / wall / 1024:,.0f} KiB/s")
+    print(f"cpu       : {used:.2f}s ({used / max(seen[0], 1) * 1e6:.1f} µs/frame, "
+          "writers included)")
+
+    runner.stop(1)
+    for d in devs:
+        d.close()
+
+
+if __name__ == "__main__":
+    main()
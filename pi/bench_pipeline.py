@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# bench_pipeline.py  –  replay + synthetic-load harness for the whole Pi pipeline
+#
+#   $ python bench_pipeline.py                              # default rate ladder
+#   $ python bench_pipeline.py --rates 70,2000 --capture grip.cap
+#   $ python bench_pipeline.py --save base.json             # on the garage Pi …
+#   $ python bench_pipeline.py --compare base.json          # … after a change
+#
+# Starts grip_server under gunicorn exactly as deployed, but with its serial
+# ports on ptys (GRIP_DEVICES) and InfluxDB replaced by fake_influx, so no
+# NodeMCU or containers are needed.  For each rate it replays synthetic or
+# captured 'CURRENT@MAX' frames, keeps /data pollers and /stream viewers busy
+# and reports:
+#
+#   ingest      frames/s the server actually parsed vs. what was written
+#   /data age   how old the newest sample is when a poller sees it (p50/p99)
+#   /stream age the same for SSE viewers (includes the per-client rate cap)
+#   cpu / rss   of the gunicorn master + worker
+#   influx      points/s reaching the (fake) database with recording on
+#
+# --compare exits 1 when any rate got worse than the baseline by more than
+# --tolerance (and, for latencies, by more than --slack-ms), so it can gate a
+# deploy.
+import argparse
+import http.client
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from array import array
+
+from fake_influx import FakeInflux
+from fake_serial import PtySerial, capture_frames, synthetic_frames
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+
+
+# ---------- server under test ---------------------------------------------
+def start_server(port, devices, influx_url, workdir):
+    env = dict(os.environ,
+               PORT=str(port),
+               GRIP_DEVICES=",".join(f"dev{i}={d.path}" for i, d in enumerate(devices)),
+               INFLUX_URL=influx_url,
+               INFLUX_TOKEN="bench",
+               GRIP_SPOOL_DIR=os.path.join(workdir, "spool"),
+               GRIP_STATE_DIR=os.path.join(workdir, "state"),
+               OTEL_SDK_DISABLED="true")     # no collector here; don't time the exporter
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "grip_server:app"],
+        cwd=HERE, env=env, stdout=subprocess.DEVNULL)
+
+
+def request(port, method, path, body=None, timeout=5):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    try:
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        conn.request(method, path, body=json.dumps(body) if body is not None else None,
+                     headers=headers)
+        r = conn.getresponse()
+        data = r.read()
+        return r.status, json.loads(data) if data and r.status == 200 else None
+    finally:
+        conn.close()
+
+
+def wait_ready(port, proc, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            sys.exit(f"grip_server exited with {proc.returncode}")
+        try:
+            if request(port, "GET", "/data")[0] == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    sys.exit("grip_server did not come up")
+
+
+class ProcStats:
+    """CPU seconds and RSS of a process and its children, from /proc."""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.peak_rss = 0
+
+    def pids(self):
+        try:
+            with open(f"/proc/{self.pid}/task/{self.pid}/children") as f:
+                return [self.pid] + [int(p) for p in f.read().split()]
+        except OSError:
+            return [self.pid]
+
+    def cpu(self):
+        total = 0
+        for pid in self.pids():
+            try:
+                with open(f"/proc/{pid}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+                total += int(fields[11]) + int(fields[12])      # utime + stime
+            except OSError:
+                pass
+        return total / CLK_TCK
+
+    def rss(self):
+        total = 0
+        for pid in self.pids():
+            try:
+                with open(f"/proc/{pid}/status") as f:
+                    for line in f:
+                        if line.startswith("VmRSS:"):
+                            total += int(line.split()[1]) * 1024
+            except OSError:
+                pass
+        self.peak_rss = max(self.peak_rss, total)
+        return total
+
+
+# ---------- load generators -----------------------------------------------
+def feed(dev, frames, rate, seconds, stamps=None):
+    """Write ``frames`` at ``rate`` frames/s for ``seconds``; returns frames written.
+
+    ``stamps`` (if given) gets the write time of every frame, in order, so the
+    server's seq number maps straight back to when that sample hit the wire.
+    """
+    start = time.perf_counter()
+    end = start + seconds
+    sent = 0
+    while True:
+        now = time.perf_counter()
+        if now >= end:
+            return sent
+        due = min(int((now - start) * rate) - sent, 256)
+        if due <= 0:
+            time.sleep(0.0005)
+            continue
+        chunk = list(itertools.islice(frames, due))
+        if not chunk:
+            return sent
+        dev.write(b"".join(chunk))
+        if stamps is not None:
+            stamps.extend(itertools.repeat(time.perf_counter(), len(chunk)))
+        sent += len(chunk)
+
+
+def poller(port, interval, stop, stamps, seq0, ages, counts):
+    """Poll /data like the fallback UI; record the age of every new sample seen."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    last, n = 0, 0
+    while not stop.is_set():
+        try:
+            conn.request("GET", "/data")
+            seq = json.loads(conn.getresponse().read())["seq"]
+        except (OSError, http.client.HTTPException, ValueError):
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            continue
+        seen = time.perf_counter()
+        n += 1
+        i = seq - seq0 - 1
+        if seq > last and 0 <= i < len(stamps):
+            ages.append(seen - stamps[i])
+        last = seq
+        if interval:
+            time.sleep(interval)
+    conn.close()
+    counts.append(n)
+
+
+def viewer(port, stop, stamps, seq0, ages):
+    """One /stream (SSE) client; record the age of every event it gets."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+    try:
+        conn.request("GET", "/stream")
+        r = conn.getresponse()
+        while not stop.is_set():
+            line = r.fp.readline()
+            if not line:
+                return
+            if line.startswith(b"data: "):
+                seen = time.perf_counter()
+                i = json.loads(line[6:])["seq"] - seq0 - 1
+                if 0 <= i < len(stamps):
+                    ages.append(seen - stamps[i])
+    except (OSError, http.client.HTTPException):
+        pass
+    finally:
+        conn.close()
+
+
+# ---------- one scenario --------------------------------------------------
+def pct(values, p):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def scenario(args, port, devs, influx, stats, rate):
+    _, m0 = request(port, "GET", "/metrics")
+    _, d0 = request(port, "GET", "/data")
+    frames0 = sum(d["ingest"]["frames"] for d in m0["devices"].values())
+    seq0 = d0["seq"]
+    points0 = influx.total()
+
+    stamps = array("d")
+    stop = threading.Event()
+    data_ages, stream_ages, counts = [], [], []
+    clients = ([threading.Thread(target=poller, args=(port, args.poll_ms / 1000, stop,
+                                                       stamps, seq0, data_ages, counts))
+                for _ in range(args.clients)] +
+               [threading.Thread(target=viewer, args=(port, stop, stamps, seq0, stream_ages))
+                for _ in range(args.viewers)])
+    for c in clients:
+        c.start()
+
+    n = int(rate * args.seconds) + 1
+    sources = [capture_frames(args.capture, n) if args.capture else synthetic_frames(n)
+               for _ in devs]
+    sent = [0] * len(devs)
+
+    def run(i):
+        sent[i] = feed(devs[i], sources[i], rate, args.seconds, stamps if i == 0 else None)
+
+    feeders = [threading.Thread(target=run, args=(i,)) for i in range(len(devs))]
+    c0, t0 = stats.cpu(), time.perf_counter()
+    for f in feeders:
+        f.start()
+    while any(f.is_alive() for f in feeders):
+        stats.rss()
+        time.sleep(0.25)
+    time.sleep(0.5)                      # let the tail drain
+    wall, cpu = time.perf_counter() - t0, stats.cpu() - c0
+    stop.set()
+    for c in clients:
+        c.join(3)
+
+    _, m1 = request(port, "GET", "/metrics")
+    parsed = sum(d["ingest"]["frames"] for d in m1["devices"].values()) - frames0
+    return {
+        "devices": len(devs),
+        "rate": rate,
+        "sent_fps": sum(sent) / args.seconds,
+        "parsed_fps": parsed / args.seconds,
+        "lost": sum(sent) - parsed,
+        "data_p50_ms": pct(data_ages, 50) * 1000,
+        "data_p99_ms": pct(data_ages, 99) * 1000,
+        "stream_p50_ms": pct(stream_ages, 50) * 1000,
+        "stream_p99_ms": pct(stream_ages, 99) * 1000,
+        "data_rps": sum(counts) / wall,
+        "cpu_pct": cpu / wall * 100,
+        "rss_mib": stats.peak_rss / 2**20,
+        "influx_pps": (influx.total() - points0) / wall,
+    }
+
+
+# ---------- report / regression check -------------------------------------
+COLUMNS = [("rate", "rate/dev", "{:.0f}"), ("sent_fps", "sent/s", "{:.0f}"),
+           ("parsed_fps", "parsed/s", "{:.0f}"), ("lost", "lost", "{:d}"),
+           ("data_p50_ms", "data p50", "{:.1f}"), ("data_p99_ms", "data p99", "{:.1f}"),
+           ("stream_p50_ms", "sse p50", "{:.1f}"), ("stream_p99_ms", "sse p99", "{:.1f}"),
+           ("data_rps", "/data rps", "{:.0f}"), ("cpu_pct", "cpu %", "{:.1f}"),
+           ("rss_mib", "rss MiB", "{:.1f}"), ("influx_pps", "influx/s", "{:.0f}")]
+
+# metric -> +1 if higher is better, -1 if lower is better
+GATED = {"parsed_fps": +1, "data_p99_ms": -1, "cpu_pct": -1, "rss_mib": -1}
+
+
+def print_table(results):
+    print("  ".join(f"{title:>9}" for _, title, _ in COLUMNS))
+    for r in results:
+        print("  ".join(f"{fmt.format(r[key]):>9}" for key, _, fmt in COLUMNS))
+
+
+def compare(results, baseline, tolerance, slack_ms):
+    base = {(r["devices"], r["rate"]): r for r in baseline}
+    worse = []
+    for r in results:
+        b = base.get((r["devices"], r["rate"]))
+        if b is None:
+            continue
+        for key, sign in GATED.items():
+            if not b[key] or b[key] != b[key]:      # zero or NaN: nothing to compare
+                continue
+            change = (r[key] - b[key]) / b[key] * sign
+            if key.endswith("_ms") and abs(r[key] - b[key]) <= slack_ms:
+                continue                            # scheduler jitter, not a regression
+            if change < -tolerance:
+                worse.append(f"rate {r['rate']:.0f}: {key} {b[key]:.1f} -> {r[key]:.1f}")
+    return worse
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Replay frames through grip_server and measure it.")
+    ap.add_argument("--rates", default="70,1000,5000,20000",
+                    help="frames/s per device, comma separated (70 ≈ 9600 baud of text frames)")
+    ap.add_argument("--seconds", type=float, default=5.0, help="per rate")
+    ap.add_argument("--devices", type=int, default=1)
+    ap.add_argument("--capture", help="replay this capture instead of synthetic squeezes")
+    ap.add_argument("--clients", type=int, default=4, help="/data pollers")
+    ap.add_argument("--poll-ms", type=float, default=50, help="poller interval (0 = flat out)")
+    ap.add_argument("--viewers", type=int, default=2, help="/stream clients")
+    ap.add_argument("--no-record", action="store_true", help="leave raw recording off")
+    ap.add_argument("--influx-latency", type=float, default=0.0, help="ms per fake write")
+    ap.add_argument("--port", type=int, default=8099)
+    ap.add_argument("--save", help="write results as JSON")
+    ap.add_argument("--compare", help="baseline JSON from --save; exit 1 on regressions")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    ap.add_argument("--slack-ms", type=float, default=20,
+                    help="latency changes smaller than this never count as regressions")
+    args = ap.parse_args()
+    rates = [float(r) for r in args.rates.split(",")]
+
+    influx = FakeInflux(latency=args.influx_latency / 1000).start()
+    devs = [PtySerial() for _ in range(args.devices)]
+    with tempfile.TemporaryDirectory() as workdir:
+        proc = start_server(args.port, devs, influx.url, workdir)
+        try:
+            wait_ready(args.port, proc)
+            stats = ProcStats(proc.pid)
+            if not args.no_record:
+                for i in range(args.devices):
+                    request(args.port, "POST", f"/devices/dev{i}/record", {"on": True})
+            print(f"idle rss {stats.rss() / 2**20:.1f} MiB, "
+                  f"{args.devices} device(s), {args.clients} pollers, {args.viewers} viewers")
+            results = [scenario(args, args.port, devs, influx, stats, rate) for rate in rates]
+        finally:
+            proc.terminate()
+            proc.wait(10)
+            for d in devs:
+                d.close()
+
+    print_table(results)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            worse = compare(results, json.load(f), args.tolerance, args.slack_ms)
+        for w in worse:
+            print("REGRESSION", w)
+        sys.exit(1 if worse else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# bench_startup.py  –  how long grip_server takes to come up
+#
+#   $ python bench_startup.py                   # 5 cold starts, medians
+#   $ python bench_startup.py --save start.json
+#   $ python bench_startup.py --compare start.json
+#
+# Measures, for grip_server started under gunicorn as deployed (pty serial
+# port, fake_influx, OTel pointed at a port nobody listens on):
+#
+#   import      `import grip_server` in a fresh interpreter
+#   first /data process spawn -> first 200 from /data (the UI is usable)
+#   healthy     process spawn -> /healthz reports every subsystem up
+#
+# and lists grip_server's slowest import statements, so whatever crept back
+# onto the import path is easy to spot.  --compare exits 1 when a
+# median got worse than the baseline by more than --tolerance and --slack-ms.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_pipeline import HERE, request
+from fake_influx import FakeInflux
+from fake_serial import PtySerial
+
+COLUMNS = (("import_ms", "import ms"), ("data_ms", "/data ms"), ("healthy_ms", "healthy ms"))
+
+
+def server_env(dev, influx_url, workdir, port=None):
+    env = dict(os.environ,
+               GRIP_DEVICES=f"dev0={dev.path}",
+               INFLUX_URL=influx_url,
+               INFLUX_TOKEN="bench",
+               GRIP_SPOOL_DIR=os.path.join(workdir, "spool"),
+               GRIP_STATE_DIR=os.path.join(workdir, "state"),
+               OTEL_EXPORTER_OTLP_ENDPOINT="127.0.0.1:9",
+               OTEL_EXPORTER_OTLP_METRICS_ENDPOINT="127.0.0.1:9")
+    if port is not None:
+        env["PORT"] = str(port)
+    return env
+
+
+def import_ms(env):
+    code = "import time; t = time.perf_counter(); import grip_server; " \
+           "print((time.perf_counter() - t) * 1000)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=HERE, env=env, check=True,
+                         capture_output=True, text=True).stdout
+    return float(out.split()[-1])
+
+
+# runs grip_server's own top-level import statements one by one, in file
+# order, so each gets the incremental cost it adds (no server, no threads)
+IMPORT_TIMER = """
+import ast, sys, time
+tree = ast.parse(open("grip_server.py").read())
+for node in tree.body:
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        t = time.perf_counter()
+        exec(compile(ast.Module([node], []), "grip_server.py", "exec"), {})
+        print((time.perf_counter() - t) * 1000, ast.unparse(node))
+"""
+
+
+def slowest_imports(env, top):
+    """[(ms, import statement)] from grip_server.py, slowest first."""
+    out = subprocess.run([sys.executable, "-c", IMPORT_TIMER], cwd=HERE, env=env, check=True,
+                         capture_output=True, text=True).stdout
+    rows = [line.split(" ", 1) for line in out.splitlines()]
+    return sorted(((float(ms), stmt) for ms, stmt in rows), reverse=True)[:top]
+
+
+def cold_start(env, port, timeout=60):
+    """(ms to first /data 200, ms to all-up /healthz) for one gunicorn start."""
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "grip_server:app"],
+        cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    data_ms = healthy_ms = None
+    try:
+        while healthy_ms is None and time.perf_counter() - t0 < timeout:
+            if proc.poll() is not None:
+                sys.exit(f"grip_server exited with {proc.returncode}")
+            try:
+                if data_ms is None and request(port, "GET", "/data")[0] == 200:
+                    data_ms = (time.perf_counter() - t0) * 1000
+                if data_ms is not None:
+                    _, health = request(port, "GET", "/healthz")
+                    if health and all(s["state"] == "up" for s in health["subsystems"].values()):
+                        healthy_ms = (time.perf_counter() - t0) * 1000
+            except OSError:
+                pass
+            time.sleep(0.01)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(10)
+        except subprocess.TimeoutExpired:    # span exporter retrying the dead endpoint
+            proc.kill()
+            proc.wait()
+    if healthy_ms is None:
+        sys.exit("grip_server did not become healthy")
+    return data_ms, healthy_ms
+
+
+def compare(result, baseline, tolerance, slack_ms):
+    worse = []
+    for key, _ in COLUMNS:
+        b, r = baseline.get(key), result[key]
+        if b and r - b > slack_ms and (r - b) / b > tolerance:
+            worse.append(f"{key} {b:.0f} -> {r:.0f}")
+    return worse
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Time grip_server's import and startup.")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    ap.add_argument("--port", type=int, default=8098)
+    ap.add_argument("--save", help="write medians as JSON")
+    ap.add_argument("--compare", help="baseline JSON from --save; exit 1 on regressions")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    ap.add_argument("--slack-ms", type=float, default=50)
+    args = ap.parse_args()
+
+    influx = FakeInflux().start()
+    dev = PtySerial()
+    runs = []
+    try:
+        for i in range(args.runs):
+            with tempfile.TemporaryDirectory() as workdir:
+                imp = import_ms(server_env(dev, influx.url, workdir))
+                data, healthy = cold_start(server_env(dev, influx.url, workdir, args.port),
+                                           args.port)
+            runs.append({"import_ms": imp, "data_ms": data, "healthy_ms": healthy})
+            print(f"run {i + 1}: " + "  ".join(f"{title} {runs[-1][key]:.0f}"
+                                               for key, title in COLUMNS))
+        with tempfile.TemporaryDirectory() as workdir:
+            slowest = slowest_imports(server_env(dev, influx.url, workdir), args.top)
+    finally:
+        dev.close()
+
+    result = {key: statistics.median(r[key] for r in runs) for key, _ in COLUMNS}
+    print("median: " + "  ".join(f"{title} {result[key]:.0f}" for key, title in COLUMNS))
+    print("slowest imports (ms):")
+    for ms, name in slowest:
+        print(f"  {ms:8.1f}  {name}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            worse = compare(result, json.load(f), args.tolerance, args.slack_ms)
+        for w in worse:
+            print("REGRESSION", w)
+        sys.exit(1 if worse else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# devices.py  –  every dynamometer plugged into this Pi, each with its own session
+#
+# A Device bundles one serial port with the live state that used to be module
+# globals in grip_server (snapshot, history, attempt recorder, session file,
+# rep detector).
+# All ports are read by one IngestGroup thread, so a second or fourth station
+# costs a file descriptor, not another poll loop.
+#
+#   GRIP_DEVICES="left=/dev/ttyUSB0,right=/dev/ttyUSB1"   # explicit ids
+#   GRIP_DEVICES unset                                   # every ttyUSB*/ttyACM*
+import collections
+import functools
+import glob
+import os
+import time
+
+import serial
+
+from attempts import AttemptDetector
+from history import SampleHistory
+from ingest import IngestGroup, SerialIngest
+from recorder import AttemptRecorder
+from sessions import DEVICE_BYTES, SessionRecorder
+from state import SessionState
+
+DISCOVER = ("/dev/ttyUSB*", "/dev/ttyACM*")
+
+
+def configured_ports(spec=None):
+    """[(id, path), …] from a GRIP_DEVICES-style spec, or whatever is plugged in."""
+    if spec is None:
+        spec = os.getenv("GRIP_DEVICES", "")
+    ports = []
+    for item in filter(None, (s.strip() for s in spec.split(","))):
+        dev_id, _, path = item.rpartition("=")
+        dev_id = dev_id or os.path.basename(path)
+        if len(dev_id.encode()) > DEVICE_BYTES:   # it names session files and index records
+            raise ValueError(f"device id {dev_id!r} is longer than {DEVICE_BYTES} bytes")
+        ports.append((dev_id, path))
+    if not spec:
+        ports = [(os.path.basename(p), p) for pattern in DISCOVER for p in sorted(glob.glob(pattern))]
+    return ports
+
+
+class Device:
+    def __init__(self, dev_id, path, on_sample, on_attempt, emit_raw, telemetry, sessions,
+                 history_size=65536, baudrate=9600):
+        """``on_sample(device, current, max)`` and ``on_attempt(device, Attempt)``
+        run on the ingest thread."""
+        self.id = dev_id
+        self.path = path
+        self.port = serial.Serial(path, baudrate, timeout=3, exclusive=True)
+        self.state = SessionState()
+        self.history = SampleHistory(history_size)
+        self.recorder = AttemptRecorder(emit_raw, tags={"device": dev_id})
+        self.session = SessionRecorder(sessions, dev_id, self.state.snap.user,
+                                       self.state.snap.side,
+                                       float(os.getenv("GRIP_SESSION_IDLE", 0.5)))
+        self.attempts = AttemptDetector(functools.partial(on_attempt, self),
+                                        float(os.getenv("GRIP_ATTEMPT_ONSET", 5.0)),
+                                        float(os.getenv("GRIP_ATTEMPT_RELEASE", 2.0)),
+                                        float(os.getenv("GRIP_ATTEMPT_MIN_S", 0.3)))
+        self.recent = collections.deque(maxlen=50)   # (user, side, Attempt), newest last
+        self.telemetry = telemetry.device(dev_id)
+        self.ingest = SerialIngest(self.port, functools.partial(on_sample, self))
+
+    def reset_board(self):
+        """Toggle DTR to reset the ESP8266 on the NodeMCU board."""
+        self.port.dtr = False          # drive DTR low (EN pulled low) – reset asserted
+        time.sleep(0.1)                # ≥ 100 ms is safe
+        self.port.reset_input_buffer() # discard any old bytes
+        self.ingest.discard()          # …and any half-read frame
+        self.port.dtr = True           # release reset – board reboots
+
+
+class DeviceRegistry:
+    def __init__(self, on_sample, on_attempt, emit_raw, telemetry, sessions,
+                 history_size=65536):
+        self.on_sample = on_sample
+        self.on_attempt = on_attempt
+        self.emit_raw = emit_raw
+        self.telemetry = telemetry
+        self.sessions = sessions
+        self.history_size = history_size
+        self.devices = {}              # id -> Device, in the order they were opened
+        self.ingests = {}              # id -> SerialIngest (live view for telemetry)
+        self.group = IngestGroup()
+
+    def open(self, dev_id, path):
+        if dev_id in self.devices:
+            raise ValueError(f"duplicate device id {dev_id!r}")
+        dev = Device(dev_id, path, self.on_sample, self.on_attempt, self.emit_raw,
+                     self.telemetry, self.sessions, self.history_size)
+        self.devices[dev_id] = dev
+        self.ingests[dev_id] = dev.ingest
+        self.group.add(dev.ingest)
+        return dev
+
+    def set_telemetry(self, telemetry):
+        """Swap in real telemetry once it's up (devices start with the no-op one)."""
+        self.telemetry = telemetry
+        for dev in list(self.devices.values()):
+            dev.telemetry = telemetry.device(dev.id)
+
+    def start(self):
+        self.group.start()
+        return self
+
+    @property
+    def default(self):
+        """The first device; what the original single-device routes talk to."""
+        return next(iter(self.devices.values()))
+
+    def get(self, dev_id):
+        return self.devices.get(dev_id)
+
+    def __iter__(self):
+        return iter(self.devices.values())
+
+    def __len__(self):
+        return len(self.devices)
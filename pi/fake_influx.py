@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# fake_influx.py  –  just enough of the InfluxDB v2 HTTP API to run grip_server
+#
+#   $ python fake_influx.py --port 8086 [--latency 20]
+#   $ INFLUX_URL=http://127.0.0.1:8086 INFLUX_TOKEN=x gunicorn -c gunicorn.conf.py grip_server:app
+#
+# Writes are counted per measurement and thrown away; queries answer with no
+# tables, so the leaderboard rebuild finds nothing and keeps its disk copy.
+import argparse
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeInflux(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr=("127.0.0.1", 0), latency=0.0):
+        """``latency`` is extra seconds every write takes, to mimic a busy Pi."""
+        super().__init__(addr, _Handler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.writes = 0
+        self.points = {}          # measurement -> count
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name="fake-influx", daemon=True).start()
+        return self
+
+    def total(self):
+        with self.lock:
+            return sum(self.points.values())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=b"", ctype="text/plain"):
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith(("/health", "/ping")):
+            return self._reply(200, b'{"status":"pass"}', "application/json")
+        self._reply(404)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        srv = self.server
+        if self.path.startswith("/api/v2/write"):
+            if "gzip" in self.headers.get("Content-Encoding", ""):
+                body = gzip.decompress(body)
+            if srv.latency:
+                time.sleep(srv.latency)
+            counts = {}
+            for line in body.splitlines():
+                if line:
+                    m = line.split(b",", 1)[0].split(b" ", 1)[0].decode()
+                    counts[m] = counts.get(m, 0) + 1
+            with srv.lock:
+                srv.writes += 1
+                for m, n in counts.items():
+                    srv.points[m] = srv.points.get(m, 0) + n
+            return self._reply(204)
+        if self.path.startswith("/api/v2/query"):
+            return self._reply(200, b"", "text/csv; charset=utf-8")
+        self._reply(404)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Stand-in InfluxDB v2 write/query API.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8086)
+    ap.add_argument("--latency", type=float, default=0.0, help="ms added to every write")
+    args = ap.parse_args()
+    srv = FakeInflux((args.host, args.port), args.latency / 1000)
+    print(f"fake influx on {srv.url}  (Ctrl-C to quit)")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"{srv.writes} writes, points: {srv.points}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# fake_serial.py  –  stand-in NodeMCU for running the ingest path without hardware
+#
+#   PtySerial() gives you a pseudo-terminal; the server side reads from
+#   ``fileno()`` (or opens ``.path`` with pyserial) while you ``write()`` or
+#   ``pump()`` frames into the other end.  A plain ``open(path, "rb")`` on a
+#   recorded capture works as a file-backed device too.
+import os
+import time
+import tty
+
+
+def synthetic_frames(n, peak=150.0, period=200):
+    """Yield ``n`` 'CURRENT@MAX\\n' frames shaped like repeated squeezes."""
+    m = 0.0
+    for i in range(n):
+        phase = (i % period) / period
+        cur = peak * (1 - abs(2 * phase - 1))
+        m = max(m, cur)
+        yield b"%.2f@%.2f\n" % (cur, m)
+
+
+def capture_frames(path, n=None):
+    """Yield frames from a capture (e.g. ``cat /dev/ttyUSB0 > grip.cap``).
+
+    Lines are replayed byte for byte, '#GRIP' status lines and boot noise
+    included, looping over the file until ``n`` frames (default: one pass).
+    """
+    with open(path, "rb") as f:
+        lines = [line for line in f if line.strip()]
+    if not lines:
+        return
+    count = len(lines) if n is None else n
+    for i in range(count):
+        line = lines[i % len(lines)]
+        yield line if line.endswith(b"\n") else line + b"\n"
+
+
+class PtySerial:
+    """A pty pair; the slave end plays the part of /dev/ttyUSB0."""
+
+    def __init__(self):
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)    # no echo / line discipline, like a real UART
+        self.path = os.ttyname(self.slave)
+
+    def fileno(self):
+        return self.slave
+
+    def write(self, data):
+        view = memoryview(data)
+        while view:
+            n = os.write(self.master, view)
+            view = view[n:]
+
+    def pump(self, frames, rate=None, chunk=64):
+        """Write ``frames`` into the pty, optionally paced at ``rate`` frames/s.
+
+        Frames are written ``chunk`` at a time so a burst looks like a busy UART
+        rather than a single giant write.
+        """
+        start = time.perf_counter()
+        batch, sent = [], 0
+        for frame in frames:
+            batch.append(frame)
+            if len(batch) >= chunk:
+                sent += self._flush(batch)
+                if rate:
+                    ahead = sent / rate - (time.perf_counter() - start)
+                    if ahead > 0:
+                        time.sleep(ahead)
+        return sent + self._flush(batch)
+
+    def _flush(self, batch):
+        n = len(batch)
+        if n:
+            self.write(b"".join(batch))
+            batch.clear()
+        return n
+
+    def close(self):
+        for fd in (self.master, self.slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# fetch_fonts.py  –  vendor the UI font into static/fonts
+#
+#   $ python fetch_fonts.py        # once, on a machine with internet
+#
+# The kiosk network has no route to Google Fonts, so the Inter files are
+# served by grip_server like any other static asset (content-hashed, cached
+# forever).  The Docker build runs this; without the files the page falls
+# back to system-ui.
+import os
+import sys
+import urllib.request
+
+BASE = "https://cdn.jsdelivr.net/npm/@fontsource/inter@5/files/"
+FILES = ("inter-latin-400-normal.woff2", "inter-latin-700-normal.woff2")
+DEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "fonts")
+
+
+def main():
+    os.makedirs(DEST, exist_ok=True)
+    for fn in FILES:
+        path = os.path.join(DEST, fn)
+        if os.path.exists(path):
+            continue
+        with urllib.request.urlopen(BASE + fn, timeout=30) as r:
+            data = r.read()
+        if data[:4] != b"wOF2":
+            sys.exit(f"{fn}: not a woff2 file")
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+        print(f"{fn}: {len(data)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,146 +1,478 @@
 #!/usr/bin/env python3
-# grip_server.py  –  live serial reader + Flask UI (polling JSON feed)
+# grip_server.py  –  live serial reader + Flask UI (SSE push, JSON polling fallback)
+#
+# Startup is staged: the UI and the ingest thread exist as soon as this module
+# is imported, while serial ports, InfluxDB and OpenTelemetry come up in the
+# background (see startup.py) and /healthz says how far they got.
+import itertools
+import json
+import math
 import os
+import queue
 
-import serial, threading, time, sys
-from flask import Flask, render_template, request, redirect, jsonify
-from influxdb_client import InfluxDBClient, Point
-from influxdb_client.client.write_api import SYNCHRONOUS
-
-
-from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.instrumentation.flask import FlaskInstrumentor
-
-trace.set_tracer_provider(
-    TracerProvider(
-        resource=Resource.create(
-            {
-                "service.name": "grip-web",
-                "service.version": "1.0.0",
-            }
-        )
-    )
-)
-span_processor = BatchSpanProcessor(OTLPSpanExporter(
-    endpoint=os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"),
-    insecure=True
-))
-trace.get_tracer_provider().add_span_processor(span_processor)
-
-
-# ---------- serial port ---------------------------------------------------
-try:
-    SER = serial.Serial('/dev/ttyUSB0', 9600, timeout=3)
-except serial.SerialException as e:
-    sys.exit(f"Cannot open /dev/ttyUSB0: {e}")
-
-# ---------- shared state --------------------------------------------------
-latest_grip = 0.0
-max_grip = 0.0            # highest value seen in session (either hand)
-current_user = "guest"
-current_side = "right"
-
-# ---------- background thread --------------------------------------------
-def serial_reader():
-    """Read lines of the form 'CURRENT@MAX\n' from NodeMCU."""
-    global latest_grip, max_grip
-    buf = b''
-    while True:
-        if SER.in_waiting:
-            buf += SER.read(SER.in_waiting)
-            while b'\n' in buf:
-                line, buf = buf.split(b'\n', 1)
-                try:
-                    data = line.decode().strip()
-                    if "@" not in data:
-                        continue
-                    cur, m = data.split("@")
-                    latest_grip = float(cur)
-                    max_grip    = float(m)
-                except ValueError:
-                    continue
-        time.sleep(0.02)          # 20 ms
-
-def reset_nodemcu():
-    """Toggle DTR to reset the ESP8266 on the NodeMCU board."""
-    SER.dtr = False          # drive DTR low  (EN pulled low) – reset asserted
-    time.sleep(0.1)          # ≥ 100 ms is safe
-    SER.reset_input_buffer() # discard any old bytes
-    SER.dtr = True           # release reset – board reboots
-
-threading.Thread(target=serial_reader, daemon=True).start()
+import threading, time
+from flask import Flask, Response, abort, render_template, request, redirect, jsonify
+
+from assets import AssetPipeline, PageCache
+from devices import DeviceRegistry, configured_ports
+from influx_writer import SpoolingWriter
+from leaderboard import Leaderboard, PERIODS
+from recorder import line, tag_set
+from sessions import EXPORTERS, FORMATS, SessionStore
+from startup import LateInstrumentation, Subsystem
+from telemetry import NoTelemetry
+
+STARTED = time.time()
+TELEMETRY = NoTelemetry()     # replaced once the tracing subsystem is up
+
+
+# ---------- per-sample path ----------------------------------------------
+def on_sample(dev, cur, m):
+    """Called by the ingest thread for every 'CURRENT@MAX' frame."""
+    now = time.time()
+    if dev.telemetry.sample(now):         # 1 in GRIP_OTEL_SPAN_EVERY
+        with TELEMETRY.tracer.start_as_current_span(
+                "serial.frame", attributes={"device": dev.id, "grip": cur, "max": m}):
+            handle_sample(dev, cur, m, now)
+    else:
+        handle_sample(dev, cur, m, now)
+
+def handle_sample(dev, cur, m, now):
+    dev.history.append(now, cur)
+    dev.session.append(now, cur)
+    dev.attempts.add(now, cur)
+    dev.recorder.add(int(now * 1e9), cur, m)
+    dev.state.sample(cur, m, now)
 
 # ---------- Influx --------------------------------------------------------
-iclient = InfluxDBClient(
-            url="http://influxdb:8086",
-            token=os.environ["INFLUX_TOKEN"],
-            org="grip")
-_influx_write_api = iclient.write_api(write_options=SYNCHRONOUS)
-
-def write_max(user, side, value):
-    p = (Point("grip_max")
-         .tag("user", user)
-         .tag("side", side)
-         .field("value", value))
-    result = _influx_write_api.write(bucket="grip", record=p)
-    print(result)
+def connect_influx():
+    from influxdb_client import InfluxDBClient
+    from influxdb_client.client.write_api import SYNCHRONOUS
+
+    client = InfluxDBClient(
+                url=os.getenv("INFLUX_URL", "http://influxdb:8086"),
+                token=os.environ["INFLUX_TOKEN"],
+                org="grip")
+    if not client.ping():
+        client.close()
+        raise ConnectionError("influxdb not answering /ping")
+    client.writes = client.write_api(write_options=SYNCHRONOUS)
+    threading.Thread(target=rebuild_leaderboard, args=(client,),
+                     name="leaderboard-rebuild", daemon=True).start()
+    return client
+
+INFLUX = Subsystem("influx", connect_influx)
+
+def influx_write(lines):
+    """SpoolingWriter's send(); until Influx is up this raises and the spool waits."""
+    client = INFLUX.value
+    if client is None:
+        raise ConnectionError("influx not connected yet")
+    client.writes.write(bucket="grip", record=lines)
+
+# saves only hit a local queue; the writer thread batches, spools to disk and
+# replays into Influx in order, so a restarting influxdb never loses a max
+WRITER = SpoolingWriter(
+    influx_write,
+    os.getenv("GRIP_SPOOL_DIR", "spool"),
+    on_flush=lambda ms, n: TELEMETRY.flushed("max", ms, n)).start()
+
+# raw attempt samples get their own queue + spool so a long recording can
+# never crowd out (or delay) a saved max
+RAW_WRITER = SpoolingWriter(
+    influx_write,
+    os.path.join(os.getenv("GRIP_SPOOL_DIR", "spool"), "raw"),
+    batch_size=5000, flush_interval=1.0, max_queue=50000,
+    on_flush=lambda ms, n: TELEMETRY.flushed("raw", ms, n)).start()
+
+LEADERBOARD = Leaderboard(os.path.join(os.getenv("GRIP_STATE_DIR", "state"), "leaderboard.json"))
+
+def write_max(dev, user, side, value, attempt=None):
+    """Queue a grip_max point (and the rep's grip_attempt point, if there is one)."""
+    ts = time.time() if attempt is None else attempt.start + attempt.time_to_peak
+    tags = tag_set(user=user, side=side, device=dev.id)
+    LEADERBOARD.record(user, side, value, ts)
+    if attempt is not None:
+        WRITER.enqueue(line("grip_attempt", tags, {
+            "peak": attempt.peak, "impulse": attempt.impulse, "duration": attempt.duration,
+            "time_to_peak": attempt.time_to_peak, "n": attempt.n}, int(attempt.start * 1e9)))
+    # stamped now (or at the peak), not whenever it gets flushed
+    return WRITER.enqueue(line("grip_max", tags, {"value": value}, int(ts * 1e9)))
+
+# ---------- auto-save -----------------------------------------------------
+# every rep the detector closes is saved with whoever the device's session
+# says is squeezing; the leaderboard may touch disk, so that happens on a
+# saver thread rather than the ingest thread
+AUTOSAVE = os.getenv("GRIP_AUTOSAVE", "1") != "0"
+SAVES = queue.Queue(1000)
+
+def on_attempt(dev, attempt):
+    snap = dev.state.snap
+    dev.recent.append((snap.user, snap.side, attempt))
+    if AUTOSAVE:
+        try:
+            SAVES.put_nowait((dev, snap.user, snap.side, attempt))
+        except queue.Full:
+            print(f"auto-save queue full; dropped a {attempt.peak:.1f} lbs rep")
+
+def save_attempts():
+    while True:
+        dev, user, side, attempt = SAVES.get()
+        if not write_max(dev, user, side, attempt.peak, attempt):
+            print(f"write queue full; auto-save of {attempt.peak:.1f} lbs lost")
+
+threading.Thread(target=save_attempts, name="auto-save", daemon=True).start()
+
+LEADERBOARD_QUERY = """
+from(bucket: "grip")
+  |> range(start: 1970-01-01T00:00:00Z)
+  |> filter(fn: (r) => r._measurement == "grip_max" and r._field == "value")
+  |> group(columns: ["user", "side"])
+  |> window(every: 1d)
+  |> max()
+"""
+
+def rebuild_leaderboard(client):
+    """Merge each user's per-day bests from Influx into the on-disk index."""
+    try:
+        tables = client.query_api().query(LEADERBOARD_QUERY)
+    except Exception as e:
+        print(f"leaderboard rebuild skipped ({e}); serving the on-disk copy")
+        return
+    LEADERBOARD.rebuild(
+        (r.values["user"], r.values["side"], r.get_value(), r.get_time().timestamp())
+        for t in tables for r in t.records)
+
+# ---------- serial ports --------------------------------------------------
+# every session at full resolution on disk (see sessions.py)
+SESSIONS = SessionStore(os.getenv("GRIP_SESSION_DIR",
+                                  os.path.join(os.getenv("GRIP_STATE_DIR", "state"), "sessions")))
+# one Device (port + snapshot + history + recorder) per dynamometer, all read
+# by a single selector thread that is running before any port is open
+DEVICES = DeviceRegistry(on_sample, on_attempt, RAW_WRITER.enqueue, TELEMETRY, SESSIONS,
+                         int(os.getenv("GRIP_HISTORY_SIZE", 65536))).start()   # ~1 MiB each
+
+def open_serial():
+    """Open every configured port not open yet; retried until all of them are."""
+    ports = configured_ports()
+    if not ports:
+        raise FileNotFoundError("no serial devices found (set GRIP_DEVICES=id=/dev/ttyUSB0,…)")
+    for dev_id, path in ports:
+        if DEVICES.get(dev_id) is None:
+            DEVICES.open(dev_id, path)
+    return DEVICES
+
+SERIAL = Subsystem("serial", open_serial, required=True)
+
+def device(dev_id):
+    """The device a route is for; the first one for the original unprefixed routes."""
+    if dev_id is None:
+        if not DEVICES:
+            abort(503, "no serial device connected yet")
+        return DEVICES.default
+    dev = DEVICES.get(dev_id)
+    if dev is None:
+        abort(404, f"no device {dev_id!r}")
+    return dev
 
 # ---------- Flask app -----------------------------------------------------
-app = Flask(__name__, static_folder="static", template_folder="templates")
-FlaskInstrumentor().instrument_app(app)
+# static/ is served from memory by static_file() below, not Flask's handler
+app = Flask(__name__, static_folder=None, template_folder="templates")
+INSTRUMENTATION = LateInstrumentation(app)
+ASSETS = AssetPipeline(os.path.join(app.root_path, "static"))
+app.jinja_env.globals["asset"] = ASSETS.url
+PAGES = PageCache(lambda user, side, api: render_template(
+    "index.html", user=user, side=side, api=api))
+
+def send_encoded(enc, cache_control):
+    """Response for an assets.Encoded: best encoding the client takes, 304 if unchanged."""
+    encoding, body = enc.pick(request.accept_encodings)
+    etag = enc.etag if encoding == "identity" else f"{enc.etag}-{encoding}"
+    resp = Response(body, mimetype=enc.mimetype, headers={"Cache-Control": cache_control})
+    if encoding != "identity":
+        resp.headers["Content-Encoding"] = encoding
+    if enc.varies:
+        resp.vary.add("Accept-Encoding")
+    resp.set_etag(etag)
+    return resp.make_conditional(request)
+
+def start_tracing():
+    global TELEMETRY
+    import tracing             # the slow imports live there
+    TELEMETRY = tracing.setup(INSTRUMENTATION)
+    DEVICES.set_telemetry(TELEMETRY)
+    TELEMETRY.observe(DEVICES.ingests, {"max": WRITER, "raw": RAW_WRITER})
+    return TELEMETRY
+
+TRACING = Subsystem("tracing", start_tracing)
+SUBSYSTEMS = (SERIAL, INFLUX, TRACING)
+for sub in SUBSYSTEMS:
+    sub.start()
 
 @app.route("/", methods=["GET","POST"])
-def index():
-    global current_user, current_side
+@app.route("/devices/<dev_id>/", methods=["GET","POST"])
+def index(dev_id=None):
+    if dev_id is None and not DEVICES:    # serial still coming up – serve the page anyway
+        return send_encoded(PAGES.get(("guest", "right", "")), "no-cache")
+    dev  = device(dev_id)
+    snap = dev.state.snap
     if request.method == "POST":
         action = request.form.get("action")
         if action == "savemax":
-            write_max(current_user, current_side, max_grip)
-        return redirect("/")
-    return render_template("index.html", user=current_user, side=current_side)
+            write_max(dev, snap.user, snap.side, snap.max)
+        return redirect(request.path)
+    api = f"/devices/{dev.id}" if dev_id is not None else ""
+    # always revalidate (the name/side baked into it change), usually a 304
+    return send_encoded(PAGES.get((snap.user, snap.side, api)), "no-cache")
+
+@app.route("/static/<path:name>")
+def static_file(name):
+    """Precompressed static files; the content-hashed names never change."""
+    enc, immutable = ASSETS.get(name)
+    if enc is None:
+        abort(404)
+    return send_encoded(enc, "public, max-age=31536000, immutable" if immutable
+                        else "no-cache")
+
+@app.route("/devices")
+def devices():
+    """Every connected dynamometer and who's on it."""
+    return jsonify([{"id": d.id, "path": d.path, "user": d.state.snap.user,
+                     "side": d.state.snap.side, "recording": d.recorder.recording}
+                    for d in DEVICES])
 
 @app.route("/data")
-def data():
+@app.route("/devices/<dev_id>/data")
+def data(dev_id=None):
     """Return latest numbers as JSON for the polling JS."""
-    return jsonify(grip=latest_grip, max=max_grip)
+    snap = device(dev_id).state.snap
+    return jsonify(grip=snap.grip, max=snap.max, seq=snap.seq)
+
+STREAM_MAX_HZ   = float(os.getenv("GRIP_STREAM_MAX_HZ", 25))
+STREAM_KEEPALIVE = 15.0
+# every open /stream parks one of gunicorn's GRIP_THREADS threads; leave a few
+# for pages, polls and saves, and send the rest of the viewers to polling
+STREAM_MAX_CLIENTS = int(os.getenv("GRIP_STREAM_MAX_CLIENTS",
+                                   max(1, int(os.getenv("GRIP_THREADS", 32)) - 8)))
+STREAM_SLOTS = threading.BoundedSemaphore(STREAM_MAX_CLIENTS)
+
+@app.route("/stream")
+@app.route("/devices/<dev_id>/stream")
+def stream(dev_id=None):
+    """Server-Sent Events feed of {grip, max}; one event per new sample, capped per client.
+
+    503 once STREAM_MAX_CLIENTS streams are open; the page then polls /data.
+    """
+    state = device(dev_id).state
+    if not STREAM_SLOTS.acquire(blocking=False):
+        return ("too many live streams; poll /data", 503, {"Retry-After": "30"})
+    def events():
+        seq, interval = 0, 1.0 / STREAM_MAX_HZ
+        yield "retry: 2000\n\n"
+        while True:
+            snap = state.wait(seq, STREAM_KEEPALIVE)
+            if snap.seq == seq:
+                yield ": keepalive\n\n"
+                continue
+            seq = snap.seq
+            TELEMETRY.delivered(snap.t, time.time())
+            yield f"data: {json.dumps({'grip': snap.grip, 'max': snap.max, 'seq': seq})}\n\n"
+            time.sleep(interval)   # samples arriving meanwhile are coalesced
+    resp = Response(events(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    resp.call_on_close(STREAM_SLOTS.release)   # runs on disconnect, started or not
+    return resp
+
+SIDES = ("right", "left")
+NAME_MAX = 64
+
+def clean_name(raw):
+    """A kiosk-typed name as it goes into tags, session files and the leaderboard:
+    control characters dropped, whitespace collapsed, at most NAME_MAX long,
+    "guest" when nothing is left."""
+    if not isinstance(raw, str):
+        return "guest"
+    name = "".join(c for c in raw if c.isprintable() or c.isspace())
+    name = " ".join(name.split())[:NAME_MAX].rstrip()
+    return name or "guest"
 
 @app.route("/meta", methods=["POST"])
-def meta():
-    global current_user, current_side, latest_grip, max_grip
+@app.route("/devices/<dev_id>/meta", methods=["POST"])
+def meta(dev_id=None):
+    dev  = device(dev_id)
     j    = request.get_json(silent=True) or {}
-    name = (j.get("name") or "guest").strip()
+    name = clean_name(j.get("name"))
     side = j.get("side", "right")
+    if side not in SIDES:
+        return (f"side must be one of {', '.join(SIDES)}", 400)
 
-    if side != current_side:
-        reset_nodemcu()
-        latest_grip  = 0.0
-        max_grip  = 0.0
+    snap = dev.state.snap
+    switched = side != snap.side
+    if switched:
+        dev.reset_board()
+        dev.history.new_session()
+        dev.attempts.reset()
+    if switched or name != snap.user:
+        dev.session.rotate(name, side)    # new session file from the next sample
+    dev.state.set_meta(name, side, reset=switched)
 
-    current_user, current_side = name, side
+    if dev.recorder.recording:            # keep tagging with whoever is squeezing
+        dev.recorder.start(name, side)
     return ("", 204)
 
+@app.route("/record", methods=["GET", "POST"])
+@app.route("/devices/<dev_id>/record", methods=["GET", "POST"])
+def record(dev_id=None):
+    """Toggle raw waveform capture: POST {"on": true|false}."""
+    dev = device(dev_id)
+    if request.method == "POST":
+        j = request.get_json(silent=True) or {}
+        if j.get("on"):
+            snap = dev.state.snap
+            dev.recorder.start(snap.user, snap.side)
+        else:
+            dev.recorder.stop()
+    return jsonify(recording=dev.recorder.recording)
+
 @app.route("/reset", methods=["POST"])
-def reset_board():
-    reset_nodemcu()            # pulses DTR as before
-    global latest_grip, max_grip
-    latest_grip = 0.0
-    max_grip = 0.0
+@app.route("/devices/<dev_id>/reset", methods=["POST"])
+def reset_board(dev_id=None):
+    dev = device(dev_id)
+    dev.reset_board()          # pulses DTR as before
+    dev.history.new_session()
+    dev.attempts.reset()
+    dev.session.rotate(dev.state.snap.user, dev.state.snap.side)
+    dev.state.reset()
     return ("", 204)
 
+@app.route("/samples")
+@app.route("/devices/<dev_id>/samples")
+def samples(dev_id=None):
+    """Every sample after the client's cursor: /samples?since=<seq>[&limit=N]."""
+    history = device(dev_id).history
+    since = request.args.get("since", type=int)
+    limit = min(max(request.args.get("limit", 2000, type=int), 1), 10000)
+    first, nxt, t, v = history.since(since, limit)
+    return jsonify(first=first, next=nxt, session=history.session_start,
+                   t=t.tolist(), v=v.tolist())
+
+@app.route("/stats")
+@app.route("/devices/<dev_id>/stats")
+def stats(dev_id=None):
+    """Peak/mean/RFD/time-to-peak over ?seconds=N, ?since=<seq> or the whole session."""
+    history = device(dev_id).history
+    seconds = request.args.get("seconds", type=float)
+    if seconds is not None:
+        start, end = history.last_seconds(seconds)
+    else:
+        start, end = history.clamp(request.args.get("since", type=int))
+    return jsonify(start=start, end=end, **history.stats(start, end))
+
 @app.route("/savemax", methods=["POST"])
-def save_max():
-    j     = request.get_json(force=True)
-    user  = j.get("name","guest")
-    side  = j.get("side","right")
-    value = float(j["value"])
-    write_max(user, side, value)
+@app.route("/devices/<dev_id>/savemax", methods=["POST"])
+def save_max(dev_id=None):
+    """Save the session max; body fields override the server's own user/side/max."""
+    dev   = device(dev_id)
+    snap  = dev.state.snap
+    j     = request.get_json(force=True, silent=True) or {}
+    user  = clean_name(j["name"]) if "name" in j else snap.user
+    side  = j.get("side", snap.side)
+    if side not in SIDES:
+        return (f"side must be one of {', '.join(SIDES)}", 400)
+    try:
+        value = float(j.get("value", snap.max))
+    except (TypeError, ValueError, OverflowError):
+        value = None
+    if value is None or not math.isfinite(value) or value < 0:
+        return ("value must be a finite number >= 0", 400)
+    if not write_max(dev, user, side, value):
+        return ("write queue full", 503)
     return ("",204)
 
+@app.route("/attempts")
+@app.route("/devices/<dev_id>/attempts")
+def attempts(dev_id=None):
+    """Reps the detector found recently (newest first); each one was auto-saved."""
+    recent = list(device(dev_id).recent)
+    return jsonify(autosave=AUTOSAVE, attempts=[
+        {"user": u, "side": s, "start": a.start, "end": a.end, "peak": a.peak,
+         "time_to_peak": a.time_to_peak, "impulse": a.impulse, "duration": a.duration}
+        for u, s, a in reversed(recent)])
+
+@app.route("/sessions")
+def sessions():
+    """Recorded sessions: /sessions?user=&device=&since=&until= (epoch seconds)."""
+    a = request.args
+    found = SESSIONS.list(a.get("user"), a.get("since", type=float),
+                          a.get("until", type=float), a.get("device"))
+    limit = min(max(a.get("limit", 500, type=int), 1), 5000)
+    return jsonify([s.as_dict() for s in found[-limit:]])
+
+@app.route("/sessions/<sid>.<fmt>")
+def session_export(sid, fmt):
+    """One session streamed out as csv, lp (line protocol) or parquet."""
+    s = SESSIONS.get(sid)
+    if s is None:
+        abort(404, f"no session {sid!r}")
+    if fmt not in EXPORTERS:
+        abort(404, f"format must be one of {', '.join(EXPORTERS)}")
+    body = EXPORTERS[fmt](SESSIONS, [s])
+    if fmt == "parquet":
+        try:
+            first = next(body)        # fails right here if pyarrow isn't installed
+        except ImportError:
+            return ("parquet export needs pyarrow (pip install pyarrow)", 501)
+        body = itertools.chain([first], body)
+    return Response(body, mimetype=FORMATS[fmt], headers={
+        "Content-Disposition": f'attachment; filename="{sid}.{fmt}"'})
+
+@app.route("/leaderboard")
+def leaderboard():
+    """Top personal bests per side: /leaderboard?period=all|year|month|week|day."""
+    period = request.args.get("period", "all")
+    if period not in PERIODS:
+        return (f"period must be one of {', '.join(PERIODS)}", 400)
+    etag, body = LEADERBOARD.render(period)
+    resp = Response(body, mimetype="application/json",
+                    headers={"Cache-Control": "no-cache"})   # always revalidate, usually 304
+    resp.set_etag(etag)
+    return resp.make_conditional(request)
+
+@app.route("/metrics")
+def metrics():
+    """Internal counters as JSON (scraped by telegraf's inputs.http)."""
+    per_device = {}
+    for d in DEVICES:
+        ingest, p = d.ingest, d.ingest.parser
+        per_device[d.id] = {
+            "ingest": {"bytes": ingest.bytes_read, "frames": p.frames,
+                       "errors": p.errors, "overruns": ingest.overruns,
+                       "dropped": getattr(p, "dropped", 0),
+                       "max_gap_us": getattr(p, "max_gap_us", 0),
+                       "sample_errors": ingest.sample_errors},
+            "device": getattr(p, "status", {})}   # the board's own '#GRIP' counters
+    first = per_device[DEVICES.default.id] if DEVICES else {"ingest": {}, "device": {}}
+    return jsonify(writer=WRITER.stats(), raw_writer=RAW_WRITER.stats(),
+                   ingest=first["ingest"], device=first["device"], devices=per_device)
+
+@app.route("/healthz")
+def healthz():
+    """Where startup got to: 200 once every required subsystem is up and the
+    ingest thread is running, else 503."""
+    ingest_alive = DEVICES.group.alive     # one thread reads every port
+    ok = ingest_alive and all(s.up for s in SUBSYSTEMS if s.required)
+    body = {"ok": ok, "uptime_s": round(time.time() - STARTED, 3),
+            "subsystems": {s.name: s.status() for s in SUBSYSTEMS},
+            "ingest": {"alive": ingest_alive},
+            "devices": {d.id: {"path": d.path, "frames": d.ingest.parser.frames,
+                               "sample_errors": d.ingest.sample_errors,
+                               "last_error": d.ingest.last_error}
+                        for d in DEVICES},
+            "spool_bytes": WRITER.stats()["spool_bytes"] + RAW_WRITER.stats()["spool_bytes"]}
+    return jsonify(body), 200 if ok else 503
+
 # ---------- run -----------------------------------------------------------
+# production: gunicorn -c gunicorn.conf.py grip_server:app  (see gunicorn.conf.py)
 if __name__ == "__main__":
     print("Serving on http://0.0.0.0:80  (Ctrl-C to quit)")
     app.run(host="0.0.0.0", port=80)
\ No newline at end of file
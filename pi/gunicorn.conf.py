@@ -0,0 +1,21 @@
+# gunicorn.conf.py  –  production serving for grip_server
+#
+#   $ gunicorn -c gunicorn.conf.py grip_server:app
+#
+# Exactly ONE worker process: it owns /dev/ttyUSB0 (opened exclusive, so a
+# second process fails loudly instead of stealing half the bytes), runs the
+# ingest thread, and hands each sample to request threads through the
+# in-memory SessionState.  HTTP concurrency comes from the thread pool, and
+# since /stream clients park a thread each, size it for spectators + polls
+# (grip_server caps streams at GRIP_THREADS - 8 and answers 503 beyond that).
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '80')}"
+workers = 1
+worker_class = "gthread"
+threads = int(os.getenv("GRIP_THREADS", 32))
+keepalive = 5                 # kiosks poll/stream over one connection
+timeout = 30                  # worker heartbeat, not request length – SSE is fine
+graceful_timeout = 5
+accesslog = None              # Flask/OTel already see every request
+errorlog = "-"
@@ -0,0 +1,92 @@
+# history.py  –  fixed-size ring of every sample the NodeMCU sends
+#
+# Two preallocated array('d') columns (timestamp, value) indexed by a global
+# sequence number; slot = seq % capacity.  Memory is fixed at 16 bytes per
+# slot, appends never allocate, and readers only ever touch the slice they ask
+# for.  There's a single writer (the ingest thread); readers take ``seq`` once
+# up front and only look below it, so no lock is needed.
+from array import array
+
+
+class SampleHistory:
+    def __init__(self, capacity=65536):
+        self.capacity = capacity
+        self.t = array("d", bytes(8 * capacity))
+        self.v = array("d", bytes(8 * capacity))
+        self.seq = 0              # seq the next sample will get
+        self.session_start = 0    # first seq of the current session
+
+    def append(self, t, value):
+        i = self.seq % self.capacity
+        self.t[i] = t
+        self.v[i] = value
+        self.seq += 1             # publish only after the slot is written
+
+    def new_session(self):
+        """Start a new session; older samples stay readable until overwritten."""
+        self.session_start = self.seq
+
+    def oldest(self):
+        """Oldest seq that is still in the buffer."""
+        return max(0, self.seq - self.capacity)
+
+    def clamp(self, since, end=None):
+        """Turn a client cursor into a valid [start, end) range of seqs."""
+        if end is None:
+            end = self.seq
+        start = self.session_start if since is None else since
+        return min(max(start, self.oldest(), 0), end), end
+
+    def window(self, start, end):
+        """Return (timestamps, values) for seqs [start, end).
+
+        Copies only the requested window, never the whole ring.
+        """
+        if end <= start:
+            return array("d"), array("d")
+        cap = self.capacity
+        a, b = start % cap, end % cap
+        if a < b:
+            return self.t[a:b], self.v[a:b]
+        # window wraps past the end of the ring
+        return self.t[a:] + self.t[:b], self.v[a:] + self.v[:b]
+
+    def since(self, since=None, limit=2000):
+        """Samples after a client cursor; returns (first_seq, next_cursor, t, v)."""
+        start, end = self.clamp(since)
+        end = min(end, start + max(limit, 0))
+        t, v = self.window(start, end)
+        return start, end, t, v
+
+    def last_seconds(self, seconds):
+        """Seq range covering the trailing ``seconds`` of the current session."""
+        end = self.seq
+        start, _ = self.clamp(None, end)
+        if end == start:
+            return start, end
+        cutoff = self.t[(end - 1) % self.capacity] - seconds
+        lo, hi = start, end - 1   # binary search – timestamps are monotonic
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.t[mid % self.capacity] < cutoff:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo, end
+
+    def stats(self, start, end):
+        """Peak, mean, rate of force development and time-to-peak over a window."""
+        t, v = self.window(start, end)
+        n = len(v)
+        if not n:
+            return {"n": 0, "peak": 0.0, "mean": 0.0, "rfd": 0.0, "time_to_peak": 0.0}
+        peak = max(v)
+        i = v.index(peak)
+        ttp = t[i] - t[0]
+        return {
+            "n": n,
+            "peak": peak,
+            "mean": sum(v) / n,
+            "rfd": (peak - v[0]) / ttp if ttp > 0 else 0.0,   # lbs/s, onset → peak
+            "time_to_peak": ttp,
+        }
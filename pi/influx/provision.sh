@@ -0,0 +1,55 @@
+#!/bin/sh
+# provision.sh  –  buckets, retention and rollup tasks for the grip InfluxDB
+#
+# Run by the influx-setup service on every `docker compose up`; safe to
+# re-run: it creates what is missing and updates the rest in place.
+#
+#   grip      saves, attempts, recordings            forever (the init bucket)
+#   telegraf  system + pipeline metrics every 15 s   7 days
+#   rollup    15 m system means, daily grip bests    forever
+#
+# The dashboards read "rollup" once a point spans 15 m (system) or a day
+# (grip), or the range reaches past telegraf's retention.
+set -eu
+export INFLUX_HOST="${INFLUX_HOST:-http://influxdb:8086}"
+export INFLUX_ORG="${INFLUX_ORG:-grip}"
+: "${INFLUX_TOKEN:?INFLUX_TOKEN must be set}"
+HERE=$(dirname "$0")
+
+until influx ping >/dev/null 2>&1; do
+  echo "waiting for $INFLUX_HOST"; sleep 2
+done
+
+bucket() {   # name retention -> sets $created
+  id=$(influx bucket list --name "$1" --hide-headers 2>/dev/null | awk '{print $1}')
+  if [ -n "$id" ]; then
+    influx bucket update --id "$id" --retention "$2" >/dev/null
+    created=0
+  else
+    influx bucket create --name "$1" --retention "$2" >/dev/null
+    created=1
+  fi
+  echo "bucket $1: retention $2"
+}
+
+task() {     # file; the name comes from its `option task = {name: …}`
+  name=$(sed -n 's/^option task = {name: "\([^"]*\)".*/\1/p' "$1")
+  id=$(influx task list --hide-headers | awk -v n="$name" '$2 == n {print $1}')
+  if [ -n "$id" ]; then
+    influx task update --id "$id" --file "$1" >/dev/null
+  else
+    influx task create --file "$1" >/dev/null
+  fi
+  echo "task $name"
+}
+
+bucket telegraf 7d
+bucket rollup 0
+if [ "$created" = 1 ]; then
+  echo "backfilling rollup from grip (once)…"
+  influx query --file "$HERE/backfill.flux" ||
+    echo "backfill failed; re-run it by hand: influx query --file backfill.flux"
+fi
+for f in "$HERE"/tasks/*.flux; do
+  task "$f"
+done
@@ -0,0 +1,222 @@
+# influx_writer.py  –  background, batched, crash-safe writes to InfluxDB
+#
+# Request handlers only enqueue a line-protocol string.  One thread batches the
+# queue (by size or age), appends each batch to an on-disk spool and then
+# sends the spool to Influx in order, remembering how far it got in a small
+# offset file.  If Influx is down the spool just grows; sends are retried with
+# exponential backoff and everything is replayed in order once it's back, even
+# across container restarts.  A batch Influx rejects outright (a 4xx: bad line,
+# wrong type for a field) would fail the same way forever and hold up
+# everything behind it, so it goes to a dead-letter file instead.
+import os
+import queue
+import random
+import threading
+import time
+
+# client errors that are worth retrying after all
+RETRYABLE_4XX = (408, 429)
+
+
+class SpoolingWriter:
+    def __init__(self, send, spool_dir, batch_size=500, flush_interval=0.5,
+                 max_queue=10000, max_backoff=60.0, on_flush=None):
+        """``send(lines)`` must write a list of line-protocol strings or raise.
+
+        ``on_flush(ms, points)`` is called after every successful batch.
+        """
+        self.send = send
+        self.on_flush = on_flush
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_backoff = max_backoff
+        self.q = queue.Queue(max_queue)
+
+        os.makedirs(spool_dir, exist_ok=True)
+        self.spool_path = os.path.join(spool_dir, "spool.lp")
+        self.offset_path = os.path.join(spool_dir, "spool.offset")
+        self.dead_path = os.path.join(spool_dir, "dead.lp")
+        self.spool = open(self.spool_path, "ab+")
+        self.offset = self._load_offset()
+        self._trim_torn_tail()
+
+        self.backoff = 0.0
+        self.retry_at = 0.0
+        # metrics
+        self.batches = 0
+        self.points = 0
+        self.last_batch = 0
+        self.last_flush_ms = 0.0
+        self.errors = 0
+        self.dropped = 0
+        self.dead_batches = 0
+        self.dead_points = 0
+
+        self._stop = threading.Event()
+        self.thread = None
+
+    # ---------- producer side ---------------------------------------------
+    def enqueue(self, line):
+        """Queue one line-protocol record; never blocks. False if the queue is full."""
+        try:
+            self.q.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def stats(self):
+        return {
+            "queue_depth": self.q.qsize(),
+            "spool_bytes": self._size() - self.offset,
+            "batches": self.batches,
+            "points": self.points,
+            "last_batch": self.last_batch,
+            "last_flush_ms": self.last_flush_ms,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "dead_batches": self.dead_batches,
+            "dead_points": self.dead_points,
+            "backoff_s": self.backoff,
+        }
+
+    # ---------- writer thread ---------------------------------------------
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="influx-writer", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def run(self):
+        while not self._stop.is_set():
+            pending = self._size() > self.offset
+            if pending:
+                wait = max(0.0, self.retry_at - time.monotonic())
+            else:
+                wait = 1.0
+            batch = self._collect(wait)
+            if batch:
+                self._append(batch)
+            if time.monotonic() >= self.retry_at:
+                self._drain()
+        # best effort: make sure everything queued at least hits the spool
+        batch = self._collect(0)
+        if batch:
+            self._append(batch)
+
+    def _collect(self, timeout):
+        """Wait up to ``timeout`` for a first line, then gather a batch."""
+        try:
+            batch = [self.q.get(timeout=timeout) if timeout > 0 else self.q.get_nowait()]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.q.get(timeout=remaining) if remaining > 0 else self.q.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _append(self, batch):
+        self.spool.seek(0, os.SEEK_END)
+        self.spool.write(("\n".join(batch) + "\n").encode())
+        self.spool.flush()
+        os.fsync(self.spool.fileno())
+
+    def _drain(self):
+        """Send spooled batches in order until caught up or a send fails."""
+        while self._size() > self.offset and not self._stop.is_set():
+            lines, nbytes = self._read_batch()
+            t0 = time.perf_counter()
+            try:
+                self.send(lines)
+            except Exception as e:
+                self.errors += 1
+                if permanent(e):
+                    self._dead_letter(lines, e)
+                    self._commit(self.offset + nbytes)
+                    continue
+                # Influx down, DNS, timeouts, 5xx: retry the same batch later
+                self.backoff = min(self.max_backoff, max(0.5, self.backoff * 2))
+                self.retry_at = time.monotonic() + self.backoff * random.uniform(0.8, 1.2)
+                print(f"influx write failed ({e}); retrying in {self.backoff:.1f}s")
+                return
+            self.last_flush_ms = (time.perf_counter() - t0) * 1000
+            self.batches += 1
+            self.points += len(lines)
+            self.last_batch = len(lines)
+            self.backoff = 0.0
+            if self.on_flush is not None:
+                self.on_flush(self.last_flush_ms, len(lines))
+            self._commit(self.offset + nbytes)
+
+    def _dead_letter(self, lines, e):
+        """Keep a rejected batch (``influx write``-able) and move past it."""
+        reason = " ".join(str(getattr(e, "body", None) or e).split())
+        with open(self.dead_path, "ab") as f:
+            f.write(f"# {time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())} "
+                    f"{getattr(e, 'status', '')} {reason}\n".encode())
+            f.write(("\n".join(lines) + "\n").encode())
+            f.flush()
+            os.fsync(f.fileno())
+        self.dead_batches += 1
+        self.dead_points += len(lines)
+        print(f"influx rejected {len(lines)} points ({getattr(e, 'status', '')} {reason[:200]}); "
+              f"moved to {self.dead_path}")
+
+    def _read_batch(self):
+        self.spool.seek(self.offset)
+        lines, nbytes = [], 0
+        for raw in self.spool:
+            nbytes += len(raw)
+            lines.append(raw.rstrip(b"\n").decode())
+            if len(lines) >= self.batch_size:
+                break
+        return lines, nbytes
+
+    # ---------- spool bookkeeping -----------------------------------------
+    def _size(self):
+        return os.fstat(self.spool.fileno()).st_size
+
+    def _load_offset(self):
+        try:
+            with open(self.offset_path) as f:
+                return min(int(f.read().strip() or 0), self._size())
+        except (OSError, ValueError):
+            return 0
+
+    def _commit(self, offset):
+        if offset >= self._size():
+            # fully caught up – start the spool over so it never grows unbounded
+            self.spool.truncate(0)
+            offset = 0
+        tmp = self.offset_path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(str(offset))
+        os.replace(tmp, self.offset_path)
+        self.offset = offset
+
+    def _trim_torn_tail(self):
+        """Drop a half-written last line left behind by a crash mid-append."""
+        size = self._size()
+        if not size:
+            return
+        self.spool.seek(max(0, size - 4096))
+        tail = self.spool.read()
+        if tail.endswith(b"\n"):
+            return
+        nl = tail.rfind(b"\n")
+        keep = size - len(tail) + nl + 1 if nl >= 0 else 0
+        self.spool.truncate(max(keep, self.offset))
+
+
+def permanent(e):
+    """True for a 4xx from Influx: the batch itself is bad and resending can't help."""
+    status = getattr(e, "status", None)
+    return isinstance(status, int) and 400 <= status < 500 and status not in RETRYABLE_4XX
@@ -0,0 +1,341 @@
+# ingest.py  –  event-driven serial ingest for the NodeMCU feed
+#
+# The reader blocks in a selector on the port's fd instead of waking up every
+# 20 ms, reads straight into one preallocated bytearray and parses frames in
+# place, so an idle port costs nothing and a sample is handed on the moment
+# its last byte arrives.
+import binascii
+import io
+import selectors
+import struct
+import threading
+from math import isfinite
+
+
+# ---------- frame parsers -------------------------------------------------
+STATUS = b"#GRIP "          # firmware counters: '#GRIP rx=1 fwd=1 bad=0 …\n'
+
+
+def parse_status(view, start, nl, into):
+    """Fold a '#GRIP k=v …' line (view[start:nl]) into the ``into`` dict."""
+    for field in bytes(view[start + len(STATUS):nl]).split():
+        k, _, v = field.partition(b"=")
+        try:
+            into[k.decode()] = int(v)
+        except ValueError:
+            pass
+
+
+class TextFrameParser:
+    """Parses the firmware's 'CURRENT@MAX\\n' text frames.
+
+    A parser only has to provide ``parse(view, start, end, emit)`` and
+    ``reset()``; swap in a different one to speak another wire format over
+    the same engine.
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self.errors = 0
+        self.status = {}          # latest firmware counters
+
+    def reset(self):
+        """Forget any per-stream state (the board was reset)."""
+
+    def parse(self, view, start, end, emit):
+        """Call ``emit(current, max)`` for every complete frame in view[start:end].
+
+        Returns the offset of the first byte that isn't part of a complete frame.
+        """
+        buf = view.obj
+        while True:
+            nl = buf.find(b"\n", start, end)
+            if nl < 0:
+                return start
+            at = buf.find(b"@", start, nl)
+            if at < 0 and buf.startswith(STATUS, start):
+                parse_status(view, start, nl, self.status)
+            elif at >= 0:             # anything else is boot noise from the board
+                try:
+                    cur, m = float(view[start:at]), float(view[at + 1:nl])
+                except ValueError:
+                    self.errors += 1
+                else:
+                    if isfinite(cur) and isfinite(m):
+                        self.frames += 1
+                        emit(cur, m)
+                    else:                 # 'nan@inf' is a corrupt frame, not a sample
+                        self.errors += 1
+            start = nl + 1
+
+
+class BinaryFrameParser:
+    """Parses the firmware's fixed 12-byte binary frames.
+
+    <B sync 0xA5> <B seq> <I ticks_us> <H current*100> <H max*100> <H crc>
+    little-endian; crc is CRC-16/CCITT-FALSE over the first 10 bytes, which is
+    exactly what binascii.crc_hqx(…, 0xFFFF) computes.  ticks_us is the
+    board's MicroPython ticks_us(), a 30-bit counter: it wraps at 2**30 µs
+    (~18 min), not 2**32.  The firmware's
+    '\n#GRIP …\n' status lines may appear between frames.
+    """
+    SYNC = 0xA5
+    FRAME = struct.Struct("<BBIHHH")
+    TICKS_MASK = 0x3FFFFFFF   # ticks_us() period on the ESP8266 (TICKS_MAX + 1 = 2**30)
+
+    def __init__(self):
+        self.frames = 0
+        self.errors = 0           # failed CRC (corrupt frame or false sync)
+        self.dropped = 0          # frames missing according to seq
+        self.last_seq = None
+        self.last_ticks = None
+        self.max_gap_us = 0       # longest board-clock gap between frames (a stall on the board)
+        self.status = {}
+
+    def reset(self):
+        self.last_seq = self.last_ticks = None
+
+    def parse(self, view, start, end, emit):
+        buf, size, unpack = view.obj, self.FRAME.size, self.FRAME.unpack_from
+        marker = b"\n" + STATUS
+        while True:
+            i = buf.find(self.SYNC, start, end)
+            st = buf.find(marker, start, end if i < 0 else i)
+            if st >= 0:
+                nl = buf.find(b"\n", st + 1, end)
+                if nl < 0:        # keep a partial status line, unless it's just noise
+                    return st if end - st < 128 else st + 1
+                parse_status(view, st + 1, nl, self.status)
+                start = nl
+                continue
+            if i < 0:             # keep a '\n#GRIP' split across reads
+                nl = buf.rfind(b"\n", max(start, end - len(marker) + 1), end)
+                return nl if nl >= 0 and marker.startswith(buf[nl:end]) else end
+            if end - i < size:
+                return i
+            _, seq, ticks, cur, m, crc = unpack(view, i)
+            if binascii.crc_hqx(view[i:i + size - 2], 0xFFFF) != crc:
+                self.errors += 1
+                start = i + 1     # false sync – resync on the next 0xA5
+                continue
+            if self.last_seq is not None:
+                self.dropped += (seq - self.last_seq - 1) & 0xFF
+                gap = (ticks - self.last_ticks) & self.TICKS_MASK   # ticks_diff()
+                if gap > self.max_gap_us:
+                    self.max_gap_us = gap
+            self.last_seq, self.last_ticks = seq, ticks
+            self.frames += 1
+            emit(cur / 100, m / 100)
+            start = i + size
+
+
+class NegotiatingParser:
+    """Text until the board announces binary framing, then binary.
+
+    Firmware built with BINARY = True prints HELLO at boot and every couple of
+    seconds after, so a server that starts mid-stream still switches over.
+    Old firmware never says it and keeps being parsed as text.
+    """
+    HELLO = b"GRIP BIN1"
+
+    def __init__(self):
+        self.text = TextFrameParser()
+        self.binary = BinaryFrameParser()
+        self.status = self.text.status = self.binary.status = {}
+        self.active = self.text
+
+    @property
+    def frames(self):
+        return self.text.frames + self.binary.frames
+
+    @property
+    def errors(self):
+        return self.text.errors + self.binary.errors
+
+    @property
+    def dropped(self):
+        return self.binary.dropped      # text frames carry no sequence number
+
+    @property
+    def max_gap_us(self):
+        return self.binary.max_gap_us
+
+    def reset(self):
+        self.text.reset()
+        self.binary.reset()
+        self.active = self.text
+
+    def parse(self, view, start, end, emit):
+        if self.active is self.text:
+            h = view.obj.find(self.HELLO, start, end)
+            if h < 0:
+                return self.text.parse(view, start, end, emit)
+            self.text.parse(view, start, h, emit)
+            self.active = self.binary
+            start = h + len(self.HELLO)
+        return self.binary.parse(view, start, end, emit)
+
+
+# ---------- reader --------------------------------------------------------
+class SerialIngest:
+    """Feeds frames from a serial port (or anything with a fileno) to ``on_sample``.
+
+    ``on_sample(current, max)`` runs on the reader thread, so it must be quick.
+    """
+
+    def __init__(self, port, on_sample, parser=None, bufsize=4096, poll_timeout=0.5):
+        self.port = port
+        self.on_sample = on_sample
+        self.parser = parser or NegotiatingParser()
+        self.poll_timeout = poll_timeout
+        self.buf = bytearray(bufsize)
+        self.view = memoryview(self.buf)
+        self.head = 0             # first unparsed byte
+        self.tail = 0             # end of valid data
+        self.bytes_read = 0
+        self.overruns = 0         # buffer filled up without a single newline
+        self.sample_errors = 0    # on_sample raised (session file I/O, EMFILE …)
+        self.last_error = None
+        self._discard = False
+        self._stop = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="serial-ingest", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def discard(self):
+        """Drop any buffered partial frame and protocol state, e.g. after the board was reset."""
+        self._discard = True
+
+    def raw(self):
+        """Unbuffered reader over the port's fd (leaves the port open)."""
+        return io.FileIO(self.port.fileno(), "rb", closefd=False)
+
+    def run(self):
+        fd = self.port.fileno()
+        raw = self.raw()
+        sel = selectors.DefaultSelector()
+        try:
+            sel.register(fd, selectors.EVENT_READ)
+        except (PermissionError, ValueError):
+            # regular files can't be polled, but reads on them never block
+            sel.close()
+            sel = None
+        try:
+            while not self._stop.is_set():
+                if sel is not None and not sel.select(self.poll_timeout):
+                    continue
+                try:
+                    if not self._read(raw):
+                        break
+                except Exception as e:
+                    self.failed(e)
+        finally:
+            if sel is not None:
+                sel.close()
+
+    def _read(self, raw):
+        """One read + parse pass. Returns False once the stream has ended."""
+        if self._discard:
+            self._discard = False
+            self.head = self.tail = 0
+            self.parser.reset()
+        if self.tail == len(self.buf):
+            self._compact()
+        try:
+            n = raw.readinto(self.view[self.tail:])
+        except OSError:           # device unplugged / pty hung up
+            return False
+        if n is None:             # spurious wakeup on a non-blocking fd
+            return True
+        if n == 0:
+            return False
+        self.bytes_read += n
+        self.tail += n
+        self.head = self.parser.parse(self.view, self.head, self.tail, self.on_sample)
+        if self.head == self.tail:
+            self.head = self.tail = 0
+        return True
+
+    def failed(self, e):
+        """``on_sample`` raised mid-parse: log, count, drop the chunk, keep reading.
+
+        Where parsing stopped is unknown, so the rest of the buffer goes rather
+        than being parsed (and partly emitted) a second time.
+        """
+        self.sample_errors += 1
+        self.last_error = f"{type(e).__name__}: {e}"
+        if self.sample_errors == 1 or self.sample_errors % 1000 == 0:
+            print(f"serial ingest: {self.last_error} ({self.sample_errors} so far)")
+        self.head = self.tail = 0
+
+    def _compact(self):
+        if self.head == 0:
+            self.overruns += 1    # a "line" longer than the buffer is garbage
+            self.tail = 0
+            return
+        n = self.tail - self.head
+        self.view[:n] = self.view[self.head:self.tail]
+        self.head, self.tail = 0, n
+
+
+class IngestGroup:
+    """Runs several SerialIngest readers on one thread and one selector.
+
+    Each device costs a registered fd rather than a thread, and nothing at all
+    while it's quiet, so going from one dynamometer to four adds work only in
+    proportion to the bytes they actually send.  Readers can be added before
+    or after ``start()`` (a port that shows up late is picked up on the next
+    poll); a reader whose port hangs up is dropped from the group.
+    """
+
+    def __init__(self, poll_timeout=0.5):
+        self.poll_timeout = poll_timeout
+        self.sel = selectors.DefaultSelector()
+        self._stop = threading.Event()
+        self.thread = None
+
+    def add(self, ingest):
+        self.sel.register(ingest.port.fileno(), selectors.EVENT_READ, (ingest, ingest.raw()))
+        return ingest
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="serial-ingest", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    @property
+    def alive(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def run(self):
+        sel = self.sel
+        try:
+            while not self._stop.is_set():
+                if not sel.get_map():             # nothing open yet
+                    self._stop.wait(self.poll_timeout)
+                    continue
+                for key, _ in sel.select(self.poll_timeout):
+                    ingest, raw = key.data
+                    try:
+                        alive = ingest._read(raw)
+                    except Exception as e:        # one device's trouble must not stop the rest
+                        ingest.failed(e)
+                        continue
+                    if not alive:
+                        print(f"serial: {getattr(ingest.port, 'port', key.fd)} hung up")
+                        sel.unregister(key.fd)
+        finally:
+            sel.close()
@@ -0,0 +1,100 @@
+# leaderboard.py  –  materialized personal bests per (period, side, user)
+#
+# Every save folds into the index in O(1), the index is persisted to a small
+# JSON file, and on startup it's merged with the per-day maxima from Influx.
+# /leaderboard then serves a pre-rendered body + ETag from memory, so the
+# kiosk can poll it as often as it likes without Influx ever being touched.
+import hashlib
+import json
+import os
+import threading
+import time
+
+PERIODS = {
+    "all":   lambda t: "all",
+    "year":  lambda t: time.strftime("%Y", t),
+    "month": lambda t: time.strftime("%Y-%m", t),
+    "week":  lambda t: time.strftime("%G-W%V", t),
+    "day":   lambda t: time.strftime("%Y-%m-%d", t),
+}
+
+
+class Leaderboard:
+    def __init__(self, path, limit=10):
+        self.path = path
+        self.limit = limit
+        self._lock = threading.Lock()
+        # period -> {"key": "2026-10", "sides": {side: {user: [lbs, ts]}}}
+        self.bests = {p: {"key": None, "sides": {}} for p in PERIODS}
+        self._rendered = {}       # (period, key) -> (etag, body); dropped on every change
+        self._load()
+
+    # ---------- updates ---------------------------------------------------
+    def record(self, user, side, value, ts=None, save=True):
+        """Fold one saved max in; returns True if it was a new best anywhere."""
+        ts = time.time() if ts is None else ts
+        now, then = time.localtime(), time.localtime(ts)
+        changed = False
+        with self._lock:
+            for period, key_of in PERIODS.items():
+                slot = self.bests[period]
+                current = key_of(now)
+                if slot["key"] != current:        # period rolled over
+                    slot["key"], slot["sides"] = current, {}
+                    changed = True
+                if key_of(then) != current:
+                    continue
+                users = slot["sides"].setdefault(side, {})
+                best = users.get(user)
+                if best is None or value > best[0]:
+                    users[user] = [value, ts]
+                    changed = True
+            if changed:
+                self._rendered = {}
+                if save:
+                    self._save()
+        return changed
+
+    def rebuild(self, rows):
+        """Merge (user, side, lbs, ts) rows, e.g. per-day maxima from Influx."""
+        for user, side, value, ts in rows:
+            self.record(user, side, value, ts, save=False)
+        with self._lock:
+            self._save()
+
+    # ---------- reads -----------------------------------------------------
+    def render(self, period):
+        """(etag, JSON body) for a period, cached until the next change."""
+        key = PERIODS[period](time.localtime())
+        cached = self._rendered.get((period, key))
+        if cached is not None:
+            return cached
+        with self._lock:
+            body = {"period": period, "key": key}
+            slot = self.bests[period]
+            if slot["key"] == key:                # else nobody has saved yet this period
+                for side, users in slot["sides"].items():
+                    top = sorted(users.items(), key=lambda kv: kv[1][0], reverse=True)
+                    body[side] = [{"user": u, "lbs": v, "time": t} for u, (v, t) in top[:self.limit]]
+            raw = json.dumps(body).encode()
+            cached = (hashlib.sha1(raw).hexdigest()[:16], raw)
+            self._rendered[(period, key)] = cached
+        return cached
+
+    # ---------- persistence -----------------------------------------------
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        for period in PERIODS:
+            if period in saved:
+                self.bests[period] = saved[period]
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.bests, f)
+        os.replace(tmp, self.path)
@@ -0,0 +1,94 @@
+# recorder.py  –  stream every sample of an attempt into Influx as grip_raw
+#
+# Runs on the ingest thread, so per sample it's one string format and one
+# non-blocking enqueue.  Alongside the raw points it keeps fixed-width rollup
+# buckets (100 ms and 1 s by default) and emits one max/mean/n point per
+# bucket as it closes, so long-range dashboards read those instead of raw.
+
+# line protocol has no escape for a line break, so those are spelled out
+_TAG_ESCAPES = str.maketrans({"\\": "\\\\", ",": r"\,", "=": r"\=", " ": r"\ ",
+                              "\n": r"\n", "\r": r"\r", "\t": r"\t"})
+
+
+def tag_set(**tags):
+    """Pre-rendered ',k=v,…' line-protocol tag set."""
+    return "".join(f",{k}={str(v).translate(_TAG_ESCAPES)}" for k, v in sorted(tags.items()))
+
+
+def line(measurement, tags, fields, t_ns):
+    """One line-protocol record; ``tags`` as rendered by tag_set(), numeric fields."""
+    body = ",".join(f"{k}={v}i" if isinstance(v, int) else f"{k}={float(v)!r}"
+                    for k, v in fields.items())
+    return f"{measurement}{tags} {body} {t_ns}"
+
+
+class Rollup:
+    """Max/mean of one fixed-width time bucket, emitted when the bucket closes."""
+    __slots__ = ("measurement", "width", "bucket", "max", "sum", "n")
+
+    def __init__(self, measurement, width_ns):
+        self.measurement = measurement
+        self.width = width_ns
+        self.bucket = None
+        self.max = self.sum = 0.0
+        self.n = 0
+
+    def add(self, t_ns, value, tags, emit):
+        b = t_ns // self.width
+        if b != self.bucket:
+            self.flush(tags, emit)
+            self.bucket, self.max, self.sum, self.n = b, value, 0.0, 0
+        elif value > self.max:
+            self.max = value
+        self.sum += value
+        self.n += 1
+
+    def flush(self, tags, emit):
+        if self.n:
+            emit(f"{self.measurement}{tags} max={self.max},mean={self.sum / self.n},"
+                 f"n={self.n}i {self.bucket * self.width}")
+        self.n = 0
+
+
+class _Recording:
+    __slots__ = ("tags", "rollups")
+
+    def __init__(self, tags, tiers):
+        self.tags = tags
+        self.rollups = [Rollup(name, width) for name, width in tiers]
+
+
+class AttemptRecorder:
+    TIERS = (("grip_100ms", 100_000_000), ("grip_1s", 1_000_000_000))
+
+    def __init__(self, emit, tiers=TIERS, tags=None):
+        """``emit(line)`` takes one line-protocol record and must not block.
+
+        ``tags`` are added to every point next to user and side.
+        """
+        self.emit = emit
+        self.tiers = tiers
+        self.tags = tags or {}
+        self.active = None        # swapped atomically; the ingest thread reads it once
+
+    @property
+    def recording(self):
+        return self.active is not None
+
+    def start(self, user, side):
+        self.stop()
+        self.active = _Recording(tag_set(user=user, side=side, **self.tags), self.tiers)
+
+    def stop(self):
+        rec, self.active = self.active, None
+        if rec is not None:
+            for r in rec.rollups:
+                r.flush(rec.tags, self.emit)
+
+    def add(self, t_ns, cur, m):
+        rec = self.active
+        if rec is None:
+            return
+        self.emit(f"grip_raw{rec.tags} value={cur},max={m} {t_ns}")
+        for r in rec.rollups:
+            r.add(t_ns, cur, rec.tags, self.emit)
@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+# sessions.py  –  every squeeze session kept at full resolution on the SD card
+#
+# A session (device, user, side, start) is two append-only column files,
+# <id>.t64 (float64 epoch seconds) and <id>.v32 (float32 lbs), each mmap'd and
+# grown CHUNK samples at a time.  The ingest thread appends with two stores
+# into mapped memory – no syscall per sample, only one fallocate + remap per
+# CHUNK.  Idle readings (≤ GRIP_SESSION_IDLE lbs) between squeezes are
+# skipped, so a day at the station is megabytes, not the full 70 Hz stream.
+#
+# index.bin holds one fixed-size record per session in start order, and
+# by-user/<user>.bin the same records per user, so listing by time (and user)
+# is a binary search.  A record's count stays -1 while the session is open;
+# after a crash the real length is found by binary-searching the preallocated
+# zero tail of the .t64 column.
+#
+# The server holds an exclusive flock on index.bin while it runs.  The CLI
+# opens the store read-only and only does crash recovery when it can take
+# that lock, i.e. when no server is writing.
+#
+#   $ python sessions.py list --user sam --since 2026-10-01
+#   $ python sessions.py export --since 2026-10-01 --format lp | influx write -b grip
+#   $ python sessions.py export 1792204049339-left --format parquet -o squeeze.parquet
+import argparse
+import csv
+import fcntl
+import hashlib
+import io
+import mmap
+import os
+import struct
+import sys
+import time
+from datetime import datetime
+from urllib.parse import quote
+
+from recorder import tag_set
+
+CHUNK = 1 << 16                                  # samples per growth step
+USER_BYTES = 4 * 64                              # clean_name()'s 64 characters as UTF-8
+DEVICE_BYTES = 32                                # longer GRIP_DEVICES ids are refused
+REC = struct.Struct(f"<qqq{USER_BYTES}s8s{DEVICE_BYTES}s")   # start_ns end_ns count user side device
+FORMATS = {"csv": "text/csv", "lp": "text/plain", "parquet": "application/vnd.apache.parquet"}
+
+
+def _field(s, n):
+    """At most ``n`` bytes of UTF-8, cut on a character boundary."""
+    b = s.encode()
+    return b if len(b) <= n else b[:n].decode(errors="ignore").encode()
+
+
+def _text(b):
+    return b.rstrip(b"\0").decode(errors="replace")
+
+
+def _stored(s, n):
+    """``s`` as it reads back from an ``n``-byte field."""
+    return _text(_field(s, n))
+
+
+class Session:
+    """One index record."""
+    __slots__ = ("start_ns", "end_ns", "count", "user", "side", "device", "offset")
+
+    def __init__(self, raw, offset):
+        start, end, count, user, side, device = REC.unpack_from(raw, offset)
+        self.start_ns, self.end_ns, self.count = start, end, count
+        self.user, self.side, self.device = _text(user), _text(side), _text(device)
+        self.offset = offset
+
+    @property
+    def id(self):
+        return f"{self.start_ns // 1_000_000}-{self.device}"
+
+    def as_dict(self):
+        return {"id": self.id, "user": self.user, "side": self.side, "device": self.device,
+                "start": self.start_ns / 1e9, "end": self.end_ns / 1e9 if self.end_ns else None,
+                "n": self.count if self.count >= 0 else None}
+
+
+# ---------- index ---------------------------------------------------------
+class SessionIndex:
+    """Append-only file of REC records, sorted by start time."""
+
+    def __init__(self, path, writable=True):
+        self.path = path
+        # no O_APPEND: pwrite must land where asked; read-only never creates the file
+        self.fd = (os.open(path, os.O_RDWR | os.O_CREAT, 0o644) if writable
+                   else os.open(path, os.O_RDONLY))
+
+    def close(self):
+        os.close(self.fd)
+
+    def __len__(self):
+        return os.fstat(self.fd).st_size // REC.size
+
+    def append(self, start_ns, user, side, device):
+        off = len(self) * REC.size       # a torn last record gets overwritten
+        os.pwrite(self.fd, REC.pack(start_ns, 0, -1, _field(user, USER_BYTES),
+                                    _field(side, 8), _field(device, DEVICE_BYTES)), off)
+        return off
+
+    def close_record(self, offset, end_ns, count):
+        os.pwrite(self.fd, struct.pack("<qq", end_ns, count), offset + 8)
+
+    def find(self, since_ns=None, until_ns=None, device=None):
+        """Sessions that started in [since, until), oldest first."""
+        n = len(self)
+        if not n:
+            return []
+        with mmap.mmap(self.fd, n * REC.size, access=mmap.ACCESS_READ) as mm:
+            start_at = lambda i: struct.unpack_from("<q", mm, i * REC.size)[0]
+            lo = 0 if since_ns is None else _bisect(start_at, n, since_ns)
+            hi = n if until_ns is None else _bisect(start_at, n, until_ns)
+            out = [Session(mm, i * REC.size) for i in range(lo, hi)]
+        if device is not None:
+            out = [s for s in out if s.device == device]
+        return out
+
+    def scan(self):
+        return self.find()
+
+
+def _bisect(key, n, value):
+    lo, hi = 0, n
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if key(mid) < value:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+# ---------- columns -------------------------------------------------------
+class _Column:
+    """An mmap'd array file that grows CHUNK items at a time."""
+
+    def __init__(self, path, typecode):
+        self.path = path
+        self.typecode = typecode
+        self.itemsize = struct.calcsize(typecode)
+        self.f = open(path, "w+b")
+        self.mm = self.view = None
+        self.cap = 0
+
+    def grow(self, cap):
+        self._unmap()
+        # really allocated, not sparse: a full SD card is an OSError here rather
+        # than SIGBUS on some later store into the mapping
+        os.posix_fallocate(self.f.fileno(), 0, cap * self.itemsize)
+        self.mm = mmap.mmap(self.f.fileno(), cap * self.itemsize)
+        self.view = memoryview(self.mm).cast(self.typecode)
+        self.cap = cap
+
+    def close(self, count):
+        self._unmap()
+        os.ftruncate(self.f.fileno(), count * self.itemsize)
+        self.f.close()
+
+    def _unmap(self):
+        if self.mm is not None:
+            self.view.release()
+            self.mm.close()
+            self.mm = self.view = None
+
+
+class SessionWriter:
+    """Appends one session's samples; owned by the ingest thread."""
+
+    def __init__(self, store, device, user, side, start):
+        self.store = store
+        self.start_ns = int(start * 1e9)
+        device = _stored(device, DEVICE_BYTES)    # the id Session.id reads back
+        self.id = f"{self.start_ns // 1_000_000}-{device}"
+        base = os.path.join(store.data_dir, self.id)
+        self.t = _Column(base + ".t64", "d")
+        self.v = _Column(base + ".v32", "f")
+        self.n = self.cap = 0
+        try:
+            self._grow()
+        except OSError:
+            for col in (self.t, self.v):
+                col.close(0)
+                os.unlink(col.path)
+            raise
+        self.offsets = store.add(self.start_ns, user, side, device)
+
+    def _grow(self):
+        self.cap += CHUNK
+        self.t.grow(self.cap)
+        self.v.grow(self.cap)
+        self.tv, self.vv = self.t.view, self.v.view
+
+    def append(self, t, value):
+        n = self.n
+        if n == self.cap:
+            self._grow()
+        self.tv[n] = t
+        self.vv[n] = value
+        self.n = n + 1
+
+    def close(self):
+        """Also safe after a failed _grow(), when the views are already gone."""
+        self.tv = self.vv = None
+        self.t.close(self.n)
+        self.v.close(self.n)
+        end_ns = int(_read(self.t.path, "d", self.n - 1, 1)[0] * 1e9) if self.n else self.start_ns
+        self.store.finish(self.offsets, end_ns, self.n)
+
+
+class SessionRecorder:
+    """Per-device session rotation; everything but rotate() runs on the ingest thread.
+
+    rotate() only parks the new user/side – the switch itself happens on the
+    next sample, so the writer is never touched from two threads.
+    """
+
+    RETRY = 10.0                  # s to wait after a write error (disk full …)
+
+    def __init__(self, store, device, user="guest", side="right", idle=0.5):
+        self.store = store
+        self.device = device
+        self.user, self.side = user, side
+        self.idle = idle
+        self.writer = None
+        self.active = False       # inside a squeeze (last value above idle)
+        self.pending = None
+        self.retry_at = 0.0
+        self.errors = 0
+
+    def rotate(self, user, side):
+        """Close the current session and start the next one for user/side."""
+        self.pending = (user, side)
+
+    def append(self, t, value):
+        if self.pending is not None:
+            self._switch()
+        if value <= self.idle:
+            if not self.active:
+                return
+            self.active = False   # keep the sample that ends the squeeze
+        else:
+            self.active = True
+        try:
+            w = self.writer
+            if w is None:
+                if t < self.retry_at:
+                    return
+                w = self.writer = SessionWriter(self.store, self.device, self.user, self.side, t)
+            w.append(t, value)
+        except OSError as e:
+            self._failed(t, e)
+
+    def _failed(self, t, e):
+        """Keep what was written, stop recording for a while; ingest carries on."""
+        self.errors += 1
+        self.retry_at = t + self.RETRY
+        print(f"session {self.device}: {e}; recording paused for {self.RETRY:.0f}s")
+        if self.writer is not None:
+            try:
+                self.writer.close()
+            except OSError:
+                pass
+            self.writer = None
+
+    def _switch(self):
+        (self.user, self.side), self.pending = self.pending, None
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        self.active = False
+
+
+# ---------- store ---------------------------------------------------------
+class SessionStore:
+    def __init__(self, root, readonly=False):
+        """The writer (grip_server) holds an exclusive flock on index.bin for
+        as long as it runs.  A ``readonly`` store (the CLI) never writes unless
+        it can take that lock, and then only to recover crashed sessions."""
+        self.root = root
+        self.data_dir = os.path.join(root, "data")
+        self.user_dir = os.path.join(root, "by-user")
+        self._users = {}
+        path = os.path.join(root, "index.bin")
+        if readonly:
+            self.index = SessionIndex(path, writable=False)   # FileNotFoundError if no store
+            try:
+                fcntl.flock(self.index.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return                # the server is running; its open sessions aren't crashed
+            ro, self.index = self.index, SessionIndex(path)
+            try:
+                self.recover()
+            finally:
+                for idx in (self.index, *self._users.values()):
+                    idx.close()
+                self.index, self._users = ro, {}
+                fcntl.flock(ro.fd, fcntl.LOCK_UN)
+            return
+        os.makedirs(self.data_dir, exist_ok=True)
+        os.makedirs(self.user_dir, exist_ok=True)
+        self.index = SessionIndex(path)
+        fcntl.flock(self.index.fd, fcntl.LOCK_EX)   # waits only while a CLI recovers
+        self.recover()
+
+    def close(self):
+        """Close the indexes (and so drop the writer's lock on index.bin)."""
+        for idx in (self.index, *self._users.values()):
+            idx.close()
+        self._users = {}
+
+    def _user_path(self, user):
+        name = quote(user, safe="")
+        if len(name) > 200:       # quoting triples non-ASCII; file names stop at 255 bytes
+            name = hashlib.sha1(user.encode()).hexdigest()
+        return os.path.join(self.user_dir, name + ".bin")
+
+    def user_index(self, user):
+        """Writable per-user index, for sessions actually being recorded."""
+        idx = self._users.get(user)
+        if idx is None:
+            idx = self._users[user] = SessionIndex(self._user_path(user))
+        return idx
+
+    def add(self, start_ns, user, side, device):
+        user = _stored(user, USER_BYTES)      # the name recover() will read back
+        u = self.user_index(user)
+        return ((self.index, self.index.append(start_ns, user, side, device)),
+                (u, u.append(start_ns, user, side, device)))
+
+    def finish(self, offsets, end_ns, count):
+        for idx, off in offsets:
+            idx.close_record(off, end_ns, count)
+
+    def recover(self):
+        """Close sessions left open by a crash (one scan at startup)."""
+        for s in self.index.scan():
+            if s.count >= 0:
+                continue
+            base = os.path.join(self.data_dir, s.id)
+            n = self._open_length(base + ".t64")
+            for path, size in ((base + ".t64", 8), (base + ".v32", 4)):
+                if os.path.exists(path):
+                    os.truncate(path, n * size)
+            end_ns = int(_read(base + ".t64", "d", n - 1, 1)[0] * 1e9) if n else s.start_ns
+            u = self.user_index(s.user)
+            self.finish([(self.index, s.offset)] +
+                        [(u, r.offset) for r in u.find(s.start_ns, s.start_ns + 1, s.device)],
+                        end_ns, n)
+
+    def _open_length(self, path):
+        """Length of a session still being written: written slots are never 0.0."""
+        try:
+            size = os.path.getsize(path) // 8
+        except OSError:
+            return 0
+        return _bisect(lambda i: _read(path, "d", i, 1)[0] == 0.0, size, True)
+
+    # ---------- reading ----------------------------------------------------
+    # with pread, not mmap: a session can be closed (and its files truncated)
+    # while an export is reading it, and touching a truncated mapping is SIGBUS
+    def list(self, user=None, since=None, until=None, device=None):
+        since_ns = None if since is None else int(since * 1e9)
+        until_ns = None if until is None else int(until * 1e9)
+        if user is None:
+            return self.index.find(since_ns, until_ns, device)
+        # a lookup neither creates nor caches anything: ?user= is whatever the client sent
+        try:
+            idx = SessionIndex(self._user_path(_stored(user, USER_BYTES)), writable=False)
+        except FileNotFoundError:
+            return []
+        try:
+            return idx.find(since_ns, until_ns, device)
+        finally:
+            idx.close()
+
+    def get(self, sid):
+        """Session by id ('<start ms>-<device>'), or None."""
+        ms, _, device = sid.partition("-")
+        try:
+            start = int(ms) * 1_000_000
+        except ValueError:
+            return None
+        for s in self.index.find(start, start + 1_000_000, device):
+            return s
+        return None
+
+    def length(self, s):
+        if s.count >= 0:
+            return s.count
+        return self._open_length(os.path.join(self.data_dir, s.id + ".t64"))
+
+    def chunks(self, s, size=8192):
+        """Yield (t, v) memoryviews of at most ``size`` samples each."""
+        n = self.length(s)
+        base = os.path.join(self.data_dir, s.id)
+        for i in range(0, n, size):
+            k = min(size, n - i)
+            t, v = _read(base + ".t64", "d", i, k), _read(base + ".v32", "f", i, k)
+            k = min(len(t), len(v))
+            if not k:
+                return
+            yield t[:k], v[:k]
+
+
+def _read(path, typecode, start, n):
+    size = struct.calcsize(typecode)
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        raw = os.pread(fd, n * size, start * size)
+    finally:
+        os.close(fd)
+    return memoryview(raw[:len(raw) // size * size]).cast(typecode)
+
+
+# ---------- exporters (bytes generators, one chunk in memory at a time) ----
+def export_csv(store, sessions, header=True):
+    buf = io.StringIO()
+    out = csv.writer(buf, lineterminator="\n")   # kiosk names may hold , or "
+    if header:
+        out.writerow(("session", "user", "side", "device", "time", "value"))
+    for s in sessions:
+        key = (s.id, s.user, s.side, s.device)
+        for t, v in store.chunks(s):
+            out.writerows((*key, f"{a:.6f}", f"{b:.2f}") for a, b in zip(t, v))
+            yield buf.getvalue().encode()
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():                # header only, no samples
+        yield buf.getvalue().encode()
+
+
+def export_lp(store, sessions, measurement="grip_session"):
+    for s in sessions:
+        head = measurement + tag_set(user=s.user, side=s.side, device=s.device) + " value="
+        for t, v in store.chunks(s):
+            yield "".join(f"{head}{b:.2f} {int(a * 1e9)}\n" for a, b in zip(t, v)).encode()
+
+
+def export_parquet(store, sessions):
+    """Parquet, one row group per chunk; needs pyarrow (optional)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    class Sink:                   # collects what the writer produced since the last yield
+        def __init__(self):
+            self.parts = []
+            self.closed = False
+
+        def write(self, b):
+            self.parts.append(bytes(b))
+            return len(b)
+
+        def flush(self):
+            pass
+
+        def take(self):
+            out, self.parts = b"".join(self.parts), []
+            return out
+
+    schema = pa.schema([("session", pa.string()), ("user", pa.string()), ("side", pa.string()),
+                        ("device", pa.string()), ("time", pa.timestamp("ns", tz="UTC")),
+                        ("value", pa.float32())])
+    sink = Sink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema)
+    for s in sessions:
+        for t, v in store.chunks(s):
+            n = len(t)
+            writer.write_table(pa.table({
+                "session": [s.id] * n, "user": [s.user] * n, "side": [s.side] * n,
+                "device": [s.device] * n,
+                "time": pa.array([int(x * 1e9) for x in t], pa.timestamp("ns", tz="UTC")),
+                "value": pa.array(v.tolist(), pa.float32())}, schema=schema))
+            yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+EXPORTERS = {"csv": export_csv, "lp": export_lp, "parquet": export_parquet}
+
+
+# ---------- CLI -----------------------------------------------------------
+def _when(s):
+    """Epoch seconds or an ISO date/time."""
+    try:
+        return float(s)
+    except ValueError:
+        return datetime.fromisoformat(s).timestamp()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="List and export recorded grip sessions.")
+    ap.add_argument("--dir", default=os.getenv("GRIP_SESSION_DIR", os.path.join(
+        os.getenv("GRIP_STATE_DIR", "state"), "sessions")))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    for name in ("list", "export"):
+        p = sub.add_parser(name)
+        p.add_argument("--user")
+        p.add_argument("--device")
+        p.add_argument("--since", type=_when)
+        p.add_argument("--until", type=_when)
+    exp = sub.choices["export"]
+    exp.add_argument("ids", nargs="*", help="session ids (default: everything matching the filters)")
+    exp.add_argument("--format", default="csv", choices=list(EXPORTERS))
+    exp.add_argument("-o", "--output", help="file (default: stdout)")
+    args = ap.parse_args()
+
+    try:
+        store = SessionStore(args.dir, readonly=True)
+    except FileNotFoundError:
+        sys.exit(f"no sessions recorded in {args.dir}")
+    if args.cmd == "export" and args.ids:
+        sessions = [s for s in map(store.get, args.ids) if s is not None]
+    else:
+        sessions = store.list(args.user, args.since, args.until, args.device)
+
+    if args.cmd == "list":
+        for s in sessions:
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(s.start_ns / 1e9))
+            print(f"{s.id:<28} {started}  {s.user:<16} {s.side:<5} {store.length(s):>9} samples")
+        return
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in EXPORTERS[args.format](store, sessions):
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# startup.py  –  staged startup: serve first, connect the slow stuff after
+#
+# Each dependency that can be slow or missing at boot (serial adapters,
+# InfluxDB, the OpenTelemetry stack) is a Subsystem: its init function runs on
+# a background thread and is retried with backoff until it succeeds, while
+# /healthz reports where each one is.  Nothing here imports anything heavy.
+import threading
+import time
+
+
+class Subsystem:
+    PENDING, STARTING, UP, DOWN = "pending", "starting", "up", "down"
+
+    def __init__(self, name, init, required=False, retry=1.0, max_retry=30.0):
+        """``init()`` returns the subsystem's handle or raises to be retried.
+
+        A ``required`` subsystem being down makes /healthz answer 503.
+        """
+        self.name = name
+        self.init = init
+        self.required = required
+        self.retry = retry
+        self.max_retry = max_retry
+        self.state = self.PENDING
+        self.value = None
+        self.error = None
+        self.attempts = 0
+        self.created = time.monotonic()
+        self.up_after = None      # seconds from creation to UP
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name=f"start-{self.name}", daemon=True)
+        self.thread.start()
+        return self
+
+    def run(self):
+        delay = self.retry
+        while True:
+            self.state = self.STARTING
+            self.attempts += 1
+            try:
+                self.value = self.init()
+            except Exception as e:    # missing device, DNS, container not up yet …
+                self.state, self.error = self.DOWN, f"{type(e).__name__}: {e}"
+                if self.attempts == 1 or delay >= self.max_retry:
+                    print(f"{self.name}: {self.error}; retrying")
+                time.sleep(delay)
+                delay = min(self.max_retry, delay * 2)
+                continue
+            self.state, self.error = self.UP, None
+            self.up_after = time.monotonic() - self.created
+            return
+
+    @property
+    def up(self):
+        return self.state == self.UP
+
+    def status(self):
+        return {"state": self.state, "required": self.required, "attempts": self.attempts,
+                "error": self.error,
+                "up_after_s": None if self.up_after is None else round(self.up_after, 3)}
+
+
+class LateInstrumentation:
+    """Lets FlaskInstrumentor be applied after the app has started serving.
+
+    Flask refuses new before/teardown hooks once a request has been handled,
+    so this installs its own trampolines up front and hands itself to
+    ``instrument_app`` later in place of the app: the wsgi wrapper and hooks
+    it registers on the stand-in are picked up by the next request.
+    """
+
+    def __init__(self, app):
+        self.wsgi_app = app.wsgi_app
+        self._before = self._teardown = None
+        app.wsgi_app = lambda environ, start_response: self.wsgi_app(environ, start_response)
+        app.before_request(self._run_before)
+        app.teardown_request(self._run_teardown)
+
+    # the part of the Flask API instrument_app uses
+    def before_request(self, fn):
+        self._before = fn
+        return fn
+
+    def teardown_request(self, fn):
+        self._teardown = fn
+        return fn
+
+    def _run_before(self):
+        if self._before is not None:
+            return self._before()
+
+    def _run_teardown(self, exc):
+        if self._teardown is not None:
+            self._teardown(exc)
@@ -0,0 +1,58 @@
+# state.py  –  the live session as one immutable, versioned snapshot
+#
+# Readers (request handlers, /stream) just grab ``STATE.snap`` – a single
+# attribute load, so they always see a consistent grip/max/user/side without
+# taking a lock.  Writers (the ingest thread, /meta, /reset) build a new
+# Snapshot and swap the reference under a condition variable, bumping ``seq``
+# and waking anyone blocked in wait(seq).  That same wait() is what push and
+# long-poll paths use instead of spinning; a slow waiter simply sees the
+# newest snapshot when it wakes, so it can never hold the reader up.
+import threading
+import time
+from typing import NamedTuple
+
+
+class Snapshot(NamedTuple):
+    seq: int
+    grip: float
+    max: float          # highest value seen in session (either hand)
+    user: str
+    side: str
+    t: float            # when the last sample arrived
+
+
+class SessionState:
+    __slots__ = ("snap", "_cond")
+
+    def __init__(self, user="guest", side="right"):
+        self.snap = Snapshot(0, 0.0, 0.0, user, side, 0.0)
+        self._cond = threading.Condition()
+
+    def _swap(self, **changes):
+        with self._cond:
+            s = self.snap
+            self.snap = s._replace(seq=s.seq + 1, **changes)
+            self._cond.notify_all()
+            return self.snap
+
+    def sample(self, grip, m, t=None):
+        """New reading from the board (ingest thread)."""
+        return self._swap(grip=grip, max=m, t=time.time() if t is None else t)
+
+    def reset(self):
+        """Zero the readings, e.g. after the board was reset."""
+        return self._swap(grip=0.0, max=0.0)
+
+    def set_meta(self, user, side, reset=False):
+        if reset:
+            return self._swap(user=user, side=side, grip=0.0, max=0.0)
+        return self._swap(user=user, side=side)
+
+    def wait(self, after, timeout=None):
+        """Block until seq moves past ``after``; returns the newest snapshot.
+
+        On timeout the returned snapshot still has seq == after.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self.snap.seq != after, timeout)
+            return self.snap
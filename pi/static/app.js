@@ -3,8 +3,9 @@ const fireWidth  = 90;   // logical pixels (canvas width)
 const fireHeight = 40;   // logical pixels (canvas height)
 const HARD_GRIP  = 150;  // lbs at which flames hit max intensity
 const BASE_FIRE_INTENSITY = 5;   // keep a tiny flame always
+const FIRE_FPS   = 30;   // frame cap; the effect doesn't need more
 
-const firePixels = new Array(fireWidth * fireHeight).fill(0);
+const firePixels = new Uint8Array(fireWidth * fireHeight);   // palette indices
 const palette = [
   "#070707","#1f0707","#2f0f07","#470f07","#571707","#671f07","#771f07",
   "#8f2707","#9f2f07","#af3f07","#bf4707","#c74707","#df4f07","#df5707","#df5707","#d75f07",
@@ -14,67 +15,128 @@ const palette = [
   "#efef9f","#ffffff"
 ];
 
+// palette → packed RGBA words, parsed once instead of 3 parseInt()s per pixel per frame
+const littleEndian = new Uint8Array(Uint32Array.of(1).buffer)[0] === 1;
+const palette32 = Uint32Array.from(palette, hex =>{
+  const r = parseInt(hex.substr(1,2),16), g = parseInt(hex.substr(3,2),16), b = parseInt(hex.substr(5,2),16);
+  return littleEndian ? ((255<<24) | (b<<16) | (g<<8) | r) >>> 0
+                      : ((r<<24) | (g<<16) | (b<<8) | 255) >>> 0;
+});
+
 const canvas = document.getElementById("fireCanvas");
 const ctx    = canvas.getContext("2d");
 canvas.width  = fireWidth;
 canvas.height = fireHeight;
+const fireImage  = ctx.createImageData(fireWidth, fireHeight);   // reused every frame
+const fireWords  = new Uint32Array(fireImage.data.buffer);
 
 function index(x,y){ return y*fireWidth + x; }
 
 function setFireSource(intensity){
-  for(let x=0;x<fireWidth;x++) firePixels[index(x,fireHeight-1)] = intensity;
+  firePixels.fill(intensity, index(0, fireHeight-1));
 }
 
+// xorshift32 – plenty random for flames, and no Math.random() per pixel
+let seed = (Date.now() ^ 0x9e3779b9) >>> 0 || 1;
+
 function updateFire(){
-  for (let y = 0; y < fireHeight - 1; y++){
-    for (let x = 0; x < fireWidth; x++){
-      const src   = index(x, y);
-      const below = src + fireWidth;
-      const decay = Math.floor(Math.random() * 3);
-      const newInt = Math.max(firePixels[below] - decay, 0);
-      const dst   = src - decay + 1;
-      firePixels[(dst < firePixels.length) ? dst : src] = newInt;
-    }
+  const last = firePixels.length;
+  let s = seed;
+  for (let src = 0; src < last - fireWidth; src++){
+    s ^= s << 13; s ^= s >>> 17; s ^= s << 5;
+    const decay = (s >>> 0) % 3;
+    const newInt = firePixels[src + fireWidth] - decay;
+    const dst = src - decay + 1;
+    firePixels[dst < last ? dst : src] = newInt > 0 ? newInt : 0;
   }
+  seed = s;
 }
 
 function renderFire(){
-  const img = ctx.getImageData(0,0,fireWidth,fireHeight);
-  for(let i=0;i<firePixels.length;i++){
-    const color = palette[firePixels[i]];
-    const r=parseInt(color.substr(1,2),16), g=parseInt(color.substr(3,2),16), b=parseInt(color.substr(5,2),16);
-    img.data[i*4+0]=r; img.data[i*4+1]=g; img.data[i*4+2]=b; img.data[i*4+3]=255;
+  for (let i = 0; i < firePixels.length; i++) fireWords[i] = palette32[firePixels[i]];
+  ctx.putImageData(fireImage, 0, 0);
+}
+
+// ---------- FRAME PACING + BENCHMARK OVERLAY (add ?fps to the URL) ----------
+const fpsBox = new URLSearchParams(location.search).has("fps") ? document.createElement("div") : null;
+if (fpsBox){
+  fpsBox.style.cssText = "position:fixed;right:8px;bottom:8px;z-index:9999;font:12px monospace;"+
+                         "background:#000a;color:#0f0;padding:4px 6px;border-radius:4px";
+  document.body.appendChild(fpsBox);
+}
+let fireRunning = false, lastFrame = 0, statFrames = 0, statWork = 0, statStart = 0;
+
+function fireLoop(now){
+  if (!fireRunning) return;
+  requestAnimationFrame(fireLoop);
+  if (now - lastFrame < 1000 / FIRE_FPS - 1) return;   // frame cap
+  lastFrame = now;
+  const t0 = performance.now();
+  updateFire(); renderFire();
+  if (fpsBox){
+    statWork += performance.now() - t0; statFrames++;
+    if (now - statStart >= 1000){
+      fpsBox.textContent = `${(statFrames * 1000 / (now - statStart)).toFixed(1)} fps · `+
+                           `${(statWork / statFrames).toFixed(2)} ms/frame`;
+      statStart = now; statFrames = 0; statWork = 0;
+    }
   }
-  ctx.putImageData(img,0,0);
 }
 
-function fireLoop(){ updateFire(); renderFire(); requestAnimationFrame(fireLoop); }
+function startFire(){
+  if (fireRunning) return;
+  fireRunning = true;
+  statStart = lastFrame = performance.now();
+  requestAnimationFrame(fireLoop);
+}
+// nobody sees a hidden tab – give the CPU back entirely
+document.addEventListener("visibilitychange", () =>{
+  if (document.hidden) fireRunning = false; else startFire();
+});
 
 // show a little flame at idle
 setFireSource(BASE_FIRE_INTENSITY);
-fireLoop();
+startFire();
 
-// ---------- POLLING & INTENSITY MAPPING ----------
+// ---------- LIVE FEED (SSE, polling fallback) & INTENSITY MAPPING ----------
 let grip=0, max=0;
+function render(j){
+  grip=j.grip; max=j.max;
+  document.getElementById("grip").textContent = grip.toFixed(2)+" lbs";
+  document.getElementById("max").textContent  =  max.toFixed(2)+" lbs";
+  const pctRaw = grip / HARD_GRIP;
+  const pct = Math.max(0, Math.min(pctRaw, 1));
+  let intensity = Math.round(pct * (palette.length - 1));
+  if (!(intensity >= 0)) intensity = BASE_FIRE_INTENSITY; // fallback if NaN
+  intensity = Math.max(BASE_FIRE_INTENSITY, Math.min(intensity, palette.length - 1));
+  setFireSource(intensity);
+}
+
+// per-device pages (/devices/<id>/) talk to that device's routes
+const API = document.body.dataset.api || "";
+
 async function poll(){
   try{
-    const r = await fetch("/data");
-    if(r.ok){
-      const j = await r.json();
-      grip=j.grip; max=j.max;
-      document.getElementById("grip").textContent = grip.toFixed(2)+" lbs";
-      document.getElementById("max").textContent  =  max.toFixed(2)+" lbs";
-      const pctRaw = grip / HARD_GRIP;
-      const pct = Math.max(0, Math.min(pctRaw, 1));
-      let intensity = Math.round(pct * (palette.length - 1));
-      if (!(intensity >= 0)) intensity = BASE_FIRE_INTENSITY; // fallback if NaN
-      intensity = Math.max(BASE_FIRE_INTENSITY, Math.min(intensity, palette.length - 1));
-      setFireSource(intensity);
-    }
+    const r = await fetch(API + "/data");
+    if(r.ok) render(await r.json());
   }catch(e){ /* ignore transient errors */ }
   setTimeout(poll,200);
 }
-poll();
+
+function subscribe(){
+  if(!window.EventSource){ poll(); return; }
+  const es = new EventSource(API + "/stream");
+  let opened = false;
+  es.onopen    = () => { opened = true; };
+  es.onmessage = (e) => render(JSON.parse(e.data));
+  // EventSource reconnects by itself once a stream has worked; if it never
+  // opened (old proxy, server without /stream) or the browser gave up on it
+  // (a 503: every stream slot taken) drop back to polling instead.
+  es.onerror   = () => {
+    if(!opened || es.readyState === EventSource.CLOSED){ es.close(); poll(); }
+  };
+}
+subscribe();
 
 // ---------- TOASTS (green, auto-dismiss) ----------
 function showToast(msg, type){
@@ -95,35 +157,70 @@ function sendMeta(){
   const name = nameInput.value.trim() || "guest";
   const side = sideSelect.value;
   hUser.textContent = `${name} (${side.charAt(0).toUpperCase()+side.slice(1)})`;
-  fetch("/meta",{ method:"POST", headers:{"Content-Type":"application/json"}, body:JSON.stringify({ name, side }) });
+  fetch(API + "/meta",{ method:"POST", headers:{"Content-Type":"application/json"}, body:JSON.stringify({ name, side }) });
 }
 nameInput.addEventListener("input",  sendMeta);
 sideSelect.addEventListener("change", sendMeta);
 
 const saveBtn  = document.getElementById("saveBtn");
-const maxLabel = document.getElementById("max");
 saveBtn.addEventListener("click", (e) =>{
   e.preventDefault();
-  fetch("/savemax",{
+  // the server saves its own session max for the current user/side –
+  // nothing is scraped back out of the page
+  fetch(API + "/savemax",{
     method : "POST",
     headers: {"Content-Type":"application/json"},
-    body   : JSON.stringify({
-      value : parseFloat(maxLabel.textContent),   // e.g. 137.2
-      name  : document.getElementById("nameInput").value.trim() || "guest",
-      side  : document.getElementById("sideSelect").value
-    })
-  }).then(r => { r.ok ? showToast("Saved!") : showToast("Save failed","error"); })
+    body   : "{}"
+  }).then(r => { r.ok ? showToast("Saved!") : showToast("Save failed","error"); if(r.ok) refreshLeaderboard(); })
     .catch(()=> showToast("Save failed","error"));
 });
 
 document.getElementById("resetBtn").addEventListener("click", () =>{
-  fetch("/reset", {method:"POST"}).then(()=>{
+  fetch(API + "/reset", {method:"POST"}).then(()=>{
     document.getElementById("grip").textContent = "0.00 lbs";
     document.getElementById("max").textContent  = "0.00 lbs";
     showToast("Cleared");
   });
 });
 
+// ---------- RECORD ATTEMPT (raw waveform → Influx) ----------
+const recordBtn = document.getElementById("recordBtn");
+function showRecording(on){
+  recordBtn.setAttribute("aria-pressed", on ? "true" : "false");
+  recordBtn.textContent = on ? "Stop" : "Record";
+}
+fetch(API + "/record").then(r => r.json()).then(j => showRecording(j.recording)).catch(()=>{});
+recordBtn.addEventListener("click", () =>{
+  const on = recordBtn.getAttribute("aria-pressed") !== "true";
+  fetch(API + "/record",{ method:"POST", headers:{"Content-Type":"application/json"}, body:JSON.stringify({ on }) })
+    .then(r => r.json()).then(j => { showRecording(j.recording); showToast(j.recording ? "Recording" : "Recording saved"); })
+    .catch(()=> showToast("Record failed","error"));
+});
+
+// ---------- LEADERBOARD (served from the server's cache, revalidated by ETag) ----------
+function fillBoard(id, rows){
+  const ol = document.getElementById(id);
+  ol.replaceChildren(...(rows || []).map(r =>{
+    const li = document.createElement("li");
+    li.textContent = `${r.user} – ${r.lbs.toFixed(1)}`;
+    return li;
+  }));
+}
+let lbTimer;
+async function refreshLeaderboard(){
+  clearTimeout(lbTimer);
+  try{
+    const r = await fetch("/leaderboard?period=all", {cache:"no-cache"});   // 304 when unchanged
+    if(r.ok){
+      const j = await r.json();
+      fillBoard("lbRight", j.right); fillBoard("lbLeft", j.left);
+      document.getElementById("leaderboard").hidden = !(j.right || j.left);
+    }
+  }catch(e){ /* keep whatever is showing */ }
+  lbTimer = setTimeout(refreshLeaderboard, 30000);
+}
+refreshLeaderboard();
+
 (function(){
   const section = document.getElementById('dashboardSection');
   const btn = document.getElementById('toggleDashboard');
@@ -0,0 +1,101 @@
+# telemetry.py  –  OpenTelemetry metrics + sampled spans for the ingest pipeline
+#
+# Cost control, because this runs on the ingest thread of a Pi:
+#   * byte / frame / error counts are *observable* instruments that read the
+#     counters SerialIngest and the parsers keep anyway – zero per-frame cost;
+#   * the inter-sample gap histogram records 1 in GRIP_OTEL_SAMPLE_EVERY frames;
+#   * a "serial.frame" span wraps 1 in GRIP_OTEL_SPAN_EVERY frames (0 = never);
+#   * GRIP_OTEL_METRICS=0 turns the whole thing into no-ops.
+
+
+class PipelineTelemetry:
+    def __init__(self, meter, tracer, sample_every=10, span_every=1000):
+        self.meter = meter
+        self.tracer = tracer
+        self.sample_every = max(1, sample_every)
+        self.span_every = span_every
+
+        self.gap = meter.create_histogram(
+            "grip.serial.gap", unit="ms", description="time between consecutive samples")
+        self.delivery = meter.create_histogram(
+            "grip.delivery.latency", unit="ms",
+            description="serial arrival → handed to a /stream client")
+        self.flush = meter.create_histogram(
+            "grip.influx.write.latency", unit="ms", description="one batch write to InfluxDB")
+
+    # ---------- observable counters / gauges ------------------------------
+    def observe(self, ingests, writers):
+        """Export counters that the ``ingests`` and ``writers`` dicts already keep."""
+        from opentelemetry.metrics import Observation   # NoTelemetry must stay import-free
+        self.meter.create_observable_counter(
+            "grip.serial.bytes", unit="By",
+            callbacks=[lambda o: [Observation(i.bytes_read, {"device": d})
+                                  for d, i in ingests.items()]])
+        self.meter.create_observable_counter(
+            "grip.serial.frames",
+            callbacks=[lambda o: [Observation(i.parser.frames, {"device": d})
+                                  for d, i in ingests.items()]])
+        self.meter.create_observable_counter(
+            "grip.serial.parse_errors",
+            callbacks=[lambda o: [obs for d, i in ingests.items() for obs in (
+                Observation(i.parser.errors, {"device": d}),
+                Observation(i.overruns, {"device": d, "kind": "overrun"}),
+                Observation(getattr(i.parser, "dropped", 0), {"device": d, "kind": "dropped"}))]])
+        self.meter.create_observable_gauge(
+            "grip.influx.queue_depth",
+            callbacks=[lambda o: [Observation(w.q.qsize(), {"writer": name})
+                                  for name, w in writers.items()]])
+        self.meter.create_observable_gauge(
+            "grip.influx.spool", unit="By",
+            callbacks=[lambda o: [Observation(w.stats()["spool_bytes"], {"writer": name})
+                                  for name, w in writers.items()]])
+
+    # ---------- hot path ----------------------------------------------------
+    def device(self, dev_id):
+        return DeviceSampler(self, dev_id)
+
+    def delivered(self, arrival, now):
+        self.delivery.record((now - arrival) * 1000)
+
+    def flushed(self, writer, ms, points):
+        self.flush.record(ms, {"writer": writer})
+
+
+class DeviceSampler:
+    """Per-device sample counter, so gaps are measured within one port's stream."""
+    __slots__ = ("gap", "attrs", "sample_every", "span_every", "n", "last")
+
+    def __init__(self, telemetry, dev_id):
+        self.gap = telemetry.gap
+        self.attrs = {"device": dev_id}
+        self.sample_every = telemetry.sample_every
+        self.span_every = telemetry.span_every
+        self.n = 0
+        self.last = 0.0
+
+    def sample(self, now):
+        """Called per sample with its arrival time; True if this one should get a span."""
+        self.n += 1
+        if self.n % self.sample_every == 0 and self.last:
+            self.gap.record((now - self.last) * 1000, self.attrs)
+        self.last = now
+        return self.span_every > 0 and self.n % self.span_every == 0
+
+
+class NoTelemetry:
+    """Stand-in when GRIP_OTEL_METRICS=0."""
+
+    def observe(self, ingests, writers):
+        pass
+
+    def device(self, dev_id):
+        return self
+
+    def sample(self, now):
+        return False
+
+    def delivered(self, arrival, now):
+        pass
+
+    def flushed(self, writer, ms, points):
+        pass
@@ -0,0 +1,56 @@
+# test_grip_server.py  –  request validation, against a pty "board" and no Influx
+#
+#   $ python -m pytest -q
+import importlib
+import json
+import os
+import time
+
+import pytest
+
+from fake_serial import PtySerial
+from sessions import SessionWriter
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    """(grip_server module, test client); Influx points at a port nobody listens on."""
+    work = tmp_path_factory.mktemp("grip")
+    dev = PtySerial()
+    os.environ.update(GRIP_DEVICES=f"left={dev.path}", INFLUX_TOKEN="test",
+                      INFLUX_URL="http://127.0.0.1:9", OTEL_SDK_DISABLED="true",
+                      GRIP_SPOOL_DIR=str(work / "spool"), GRIP_STATE_DIR=str(work / "state"))
+    mod = importlib.import_module("grip_server")
+    deadline = time.monotonic() + 10
+    while not mod.DEVICES and time.monotonic() < deadline:   # serial comes up in the background
+        time.sleep(0.05)
+    yield mod, mod.app.test_client()
+    dev.close()
+
+
+@pytest.mark.parametrize("value", ["inf", "-inf", "nan", "1e999", "abc", None, -1])
+def test_savemax_rejects_bad_values(server, value):
+    mod, client = server
+    before = mod.LEADERBOARD.render("all")
+    r = client.post("/savemax", json={"name": "tester", "value": value})
+    assert r.status_code == 400
+    assert mod.LEADERBOARD.render("all") == before
+
+
+def test_savemax_accepts_a_number(server):
+    _, client = server
+    assert client.post("/savemax", json={"name": "tester", "value": "12.5"}).status_code == 204
+    body = client.get("/leaderboard").get_data()
+    json.loads(body, parse_constant=pytest.fail)      # no Infinity/NaN, i.e. strict JSON
+
+
+@pytest.mark.parametrize("limit, n", [(0, 1), (-2, 1), (2, 2), (10**9, 3)])
+def test_sessions_limit_is_clamped(server, limit, n):
+    mod, client = server
+    if not mod.SESSIONS.list(device="bench"):
+        for start in (1e9, 1e9 + 60, 1e9 + 120):
+            w = SessionWriter(mod.SESSIONS, "bench", "tester", "left", start)
+            w.append(start, 1.0)
+            w.close()
+    got = client.get(f"/sessions?device=bench&limit={limit}").get_json()
+    assert len(got) == n
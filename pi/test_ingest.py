@@ -0,0 +1,38 @@
+# test_ingest.py  –  frame parsers, fed the way a serial port delivers bytes
+#
+#   $ python -m pytest -q
+import binascii
+import struct
+
+from ingest import BinaryFrameParser, TextFrameParser
+
+
+def parse(parser, data):
+    """[(current, max)] the parser emits for ``data`` in one read."""
+    buf, out = bytearray(data), []
+    parser.parse(memoryview(buf), 0, len(buf), lambda c, m: out.append((c, m)))
+    return out
+
+
+def frame(seq, ticks, cur=1.0):
+    """One binary frame as the firmware packs it."""
+    head = struct.pack("<BBIHH", 0xA5, seq, ticks, int(cur * 100), int(cur * 100))
+    return head + struct.pack("<H", binascii.crc_hqx(head, 0xFFFF))
+
+
+def test_text_rejects_non_finite_frames():
+    p = TextFrameParser()
+    got = parse(p, b"1.5@2.0\nnan@inf\n3.0@-inf\nx@1\n4.0@4.0\n")
+    assert got == [(1.5, 2.0), (4.0, 4.0)]
+    assert p.frames == 2
+    assert p.errors == 3
+
+
+def test_binary_gap_across_ticks_wrap():
+    # ticks_us() on the board is 30 bits: 70 µs across the wrap is 70 µs
+    p = BinaryFrameParser()
+    wrap = 1 << 30
+    got = parse(p, frame(1, wrap - 30) + frame(2, 40) + frame(3, 110))
+    assert len(got) == 3
+    assert p.dropped == 0
+    assert p.max_gap_us == 70
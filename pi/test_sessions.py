@@ -0,0 +1,45 @@
+# test_sessions.py  –  session store round trips on a temp directory
+#
+#   $ python -m pytest -q
+import pytest
+
+from devices import configured_ports
+from sessions import USER_BYTES, SessionStore, SessionWriter, _field
+
+
+def record(store, device, user, n=10, start=1_700_000_000.0):
+    w = SessionWriter(store, device, user, "left", start)
+    for i in range(n):
+        w.append(start + i / 70, 10.0 + i)
+    return w
+
+
+def test_long_names_round_trip(tmp_path):
+    store = SessionStore(str(tmp_path))
+    user = "\N{GRINNING FACE}" * 64                 # clean_name()'s limit, 4 bytes a character
+    w = record(store, "left-station-2", user)
+    w.close()
+    [s] = store.list(user=user)
+    assert (s.user, s.device, s.id, s.count) == (user, "left-station-2", w.id, 10)
+    assert store.get(w.id).id == w.id
+
+
+def test_field_cuts_on_a_character_boundary():
+    cut = _field("a" + "é" * USER_BYTES, USER_BYTES)
+    assert len(cut) == USER_BYTES - 1               # no half of an 'é' left behind
+    assert cut.decode() == "a" + "é" * ((USER_BYTES - 1) // 2)
+
+
+def test_recover_closes_the_by_user_record(tmp_path):
+    store = SessionStore(str(tmp_path))
+    w = record(store, "dev0", "sam")                # never closed: a crash mid-session
+    store.close()
+    store = SessionStore(str(tmp_path))
+    [s] = store.list(user="sam")
+    assert (s.id, s.count) == (w.id, 10)
+
+
+def test_overlong_device_ids_are_refused():
+    with pytest.raises(ValueError):
+        configured_ports("a-device-id-much-longer-than-thirty-two-bytes=/dev/ttyUSB0")
+    assert configured_ports("left=/dev/ttyUSB0") == [("left", "/dev/ttyUSB0")]
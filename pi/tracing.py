@@ -0,0 +1,51 @@
+# tracing.py  –  OpenTelemetry set-up for grip_server
+#
+# Importing the SDK, the gRPC exporters and the Flask instrumentation is the
+# slowest part of grip_server's startup, so this module is only imported by
+# the "tracing" Subsystem's background thread, after the UI is already up.
+import os
+
+from opentelemetry import metrics, trace
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
+from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.instrumentation.flask import FlaskInstrumentor
+
+from telemetry import NoTelemetry, PipelineTelemetry
+
+
+def setup(app):
+    """Install providers, instrument ``app`` (a LateInstrumentation); returns the telemetry."""
+    resource = Resource.create(
+        {
+            "service.name": "grip-web",
+            "service.version": "1.0.0",
+        }
+    )
+    trace.set_tracer_provider(TracerProvider(resource=resource))
+    span_processor = BatchSpanProcessor(OTLPSpanExporter(
+        endpoint=os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"),
+        insecure=True
+    ))
+    trace.get_tracer_provider().add_span_processor(span_processor)
+
+    # a /stream span would last as long as the browser tab, so leave it out
+    FlaskInstrumentor().instrument_app(app, excluded_urls="stream")
+
+    # pipeline metrics go to telegraf's OTLP listener (Tempo only takes traces)
+    if os.getenv("GRIP_OTEL_METRICS", "1") == "0":
+        return NoTelemetry()
+    metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=[
+        PeriodicExportingMetricReader(
+            OTLPMetricExporter(
+                endpoint=os.getenv("OTEL_EXPORTER_OTLP_METRICS_ENDPOINT", "telegraf:4317"),
+                insecure=True),
+            export_interval_millis=int(os.getenv("GRIP_OTEL_EXPORT_MS", 15000)))]))
+    return PipelineTelemetry(
+        metrics.get_meter("grip.pipeline"), trace.get_tracer("grip.pipeline"),
+        sample_every=int(os.getenv("GRIP_OTEL_SAMPLE_EVERY", 10)),
+        span_every=int(os.getenv("GRIP_OTEL_SPAN_EVERY", 1000)))
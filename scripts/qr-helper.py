@@ -1,5 +1,13 @@
+import argparse
+
+ap = argparse.ArgumentParser(description="Turn qrencode ASCII output into a packed MONO_HLSB bitmap.")
+ap.add_argument("src", nargs="?", default="qr.txt")
+ap.add_argument("--scale", type=int, default=2, help="pixels per character cell")
+ap.add_argument("--width", type=int, default=128, help="clip to the display width")
+args = ap.parse_args()
+
 out = []
-with open("qr.txt") as f:
+with open(args.src) as f:
     for line in f:
         line = line.rstrip("\n")
         if not line.strip():
@@ -7,7 +15,24 @@ with open("qr.txt") as f:
         row = "".join("1" if ch == "#" else "0" for ch in line)
         out.append(row)
 
-print("qrcode = [")
-for r in out:
-    print(f'    "{r}",')
-print("]")
\ No newline at end of file
+# pre-scale so the firmware can draw it with a single framebuf blit
+width = min(max(len(r) for r in out) * args.scale, args.width)
+height = len(out) * args.scale
+stride = (width + 7) // 8
+bitmap = bytearray(stride * height)
+for y, row in enumerate(out):
+    for x, ch in enumerate(row):
+        if ch != "1":
+            continue
+        for dy in range(args.scale):
+            for dx in range(args.scale):
+                px, py = x * args.scale + dx, y * args.scale + dy
+                if px < width:
+                    bitmap[py * stride + px // 8] |= 0x80 >> (px % 8)   # MONO_HLSB: MSB first
+
+print(f"QR_WIDTH = {width}")
+print(f"QR_HEIGHT = {height}")
+print("QR_BITMAP = (")
+for i in range(0, len(bitmap), stride):
+    print('    b"' + "".join(f"\\x{b:02x}" for b in bitmap[i:i + stride]) + '"')
+print(")")